@@ -7,21 +7,39 @@ __version__ = "0.1.0"
 
 from .downloaders.tiktok import TikTokDownloader
 from .extractors import (
+    ChunkColumns,
+    MediaInfo,
+    MediaLimits,
     Recipe,
     TextChunk,
+    TranscriptArchive,
+    Transcription,
     extract_recipe,
     extract_recipe_from_url,
     extract_recipe_from_video,
+    ocr_to_chunks,
+    preflight,
+    probe_media,
     transcribe,
+    transcribe_result,
     transcribe_to_chunks,
 )
 
 __all__ = [
     "TikTokDownloader",
     "TextChunk",
+    "ChunkColumns",
+    "Transcription",
+    "TranscriptArchive",
     "Recipe",
+    "MediaInfo",
+    "MediaLimits",
+    "preflight",
+    "probe_media",
     "transcribe",
+    "transcribe_result",
     "transcribe_to_chunks",
+    "ocr_to_chunks",
     "extract_recipe",
     "extract_recipe_from_url",
     "extract_recipe_from_video",
@@ -2,12 +2,17 @@ import asyncio
 import logging
 import os
 import re
+import threading
 
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 
+from recipes_bot.downloaders.tiktok import TikTokDownloader
+from recipes_bot.extractors.audio import RoutingPolicy, preload_whisper_models
+from recipes_bot.extractors.media import MediaLimits
 from recipes_bot.extractors.recipe import extract_recipe_from_url
 from recipes_bot.extractors.models import Recipe
+from recipes_bot.search import get_default_index
 
 
 class TokenRedactingFormatter(logging.Formatter):
@@ -72,11 +77,49 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         "Welcome to the Recipe Bot!\n\n"
         "Send me a TikTok video link containing a recipe, "
         "and I'll extract the recipe for you.\n\n"
-        "Just paste the link and I'll do the rest!"
+        "Just paste the link and I'll do the rest!\n\n"
+        "Use /search followed by a few words (e.g. /search chicken orzo) "
+        "to find a recipe you already extracted."
     )
     await update.message.reply_text(welcome_message)
 
 
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not update.message:
+        return
+    
+    query = " ".join(context.args or [])
+    if not query.strip():
+        await update.message.reply_text(
+            "Please add what to search for.\n"
+            "Example: /search chicken orzo"
+        )
+        return
+    
+    index = get_default_index()
+    if index is None:
+        await update.message.reply_text("Recipe search is not enabled on this bot.")
+        return
+    
+    user = update.effective_user
+    logger.info("User %s (id=%s) searched for: %s", user.username, user.id, query)
+    # Off the event loop: search waits on the index lock while a compaction runs
+    recipes = await asyncio.to_thread(index.search, query, limit=5)
+    if not recipes:
+        await update.message.reply_text(
+            f"No saved recipes match \"{query}\". Send me the TikTok link to extract it."
+        )
+        return
+    
+    lines = [format_recipe_telegram(recipes[0])]
+    if len(recipes) > 1:
+        lines.extend(["", "*Other matches:*"])
+        for recipe in recipes[1:]:
+            escaped = recipe.title.replace("_", "\\_").replace("*", "\\*")
+            lines.append(f"• {escaped}")
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not update.message or not update.message.text:
         return
@@ -131,9 +174,28 @@ def main() -> None:
     
     setup_logging(token)
     
+    # Fail fast on malformed configuration instead of on every request
+    MediaLimits.from_env()
+    policy = RoutingPolicy.from_env()
+    TikTokDownloader.hedged()
+    
+    # Load Whisper models in the background, so the first requests do not wait for them
+    threading.Thread(
+        target=preload_whisper_models,
+        args=(policy,),
+        name="whisper-preload",
+        daemon=True,
+    ).start()
+    
+    # Memory-map the search index once at startup
+    index = get_default_index()
+    if index is not None:
+        logger.info("Loaded recipe index with %d recipes", len(index))
+    
     application = Application.builder().token(token).build()
     
     application.add_handler(CommandHandler("start", start_command))
+    application.add_handler(CommandHandler("search", search_command))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     
     logger.info("Bot is starting...")
@@ -0,0 +1,320 @@
+"""Hedged downloads across several providers to cut tail latency."""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEDGE_DELAY_S = 8.0
+DEFAULT_DEADLINE_S = 90.0
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a provider when another provider already won the race."""
+
+
+class DownloadProvider(ABC):
+    """A single strategy for fetching a video URL into a local file."""
+
+    name = "provider"
+
+    @abstractmethod
+    def fetch(self, url: str, output_path: str, cancel: threading.Event, deadline: float) -> None:
+        """
+        Download the video behind `url` into `output_path`.
+
+        Implementations should check `cancel` regularly and raise
+        `DownloadCancelled` once it is set, and should not block past
+        `deadline` (a `time.monotonic()` timestamp).
+        """
+
+
+class HttpProvider(DownloadProvider):
+    """Resolve a direct media URL, then stream it over HTTP."""
+
+    def __init__(
+        self,
+        name: str,
+        resolve: Callable[[str], Tuple[str, Dict[str, str]]],
+        chunk_size: int = 8192,
+    ):
+        """
+        Args:
+            name: Provider name used in logs and health tracking
+            resolve: Maps a page URL to (direct media URL, request headers)
+            chunk_size: Streaming chunk size in bytes
+        """
+        self.name = name
+        self.resolve = resolve
+        self.chunk_size = chunk_size
+
+    def resolve_media(self, url: str, cancel: threading.Event, deadline: float) -> Tuple[str, Dict[str, str]]:
+        """
+        Map a page URL to (direct media URL, request headers).
+
+        Subclasses with slow resolvers override this to honour `cancel` and `deadline`.
+        """
+        return self.resolve(url)
+
+    def fetch(self, url: str, output_path: str, cancel: threading.Event, deadline: float) -> None:
+        video_url, headers = self.resolve_media(url, cancel, deadline)
+        if cancel.is_set():
+            raise DownloadCancelled(self.name)
+
+        timeout = max(deadline - time.monotonic(), 0.1)
+        response = requests.get(video_url, stream=True, headers=headers, timeout=timeout)
+        try:
+            response.raise_for_status()
+            with open(output_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if cancel.is_set():
+                        raise DownloadCancelled(self.name)
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"{self.name} exceeded the download deadline")
+                    f.write(chunk)
+        finally:
+            response.close()
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling health of a provider, with a simple circuit breaker."""
+
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ewma_s: Optional[float] = None
+    open_until: float = 0.0
+
+    def is_available(self, now: float) -> bool:
+        """Whether the circuit is closed, or half-open after its cooldown."""
+        return now >= self.open_until
+
+    def record_success(self, latency_s: float, alpha: float = 0.3) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        if self.latency_ewma_s is None:
+            self.latency_ewma_s = latency_s
+        else:
+            self.latency_ewma_s = alpha * latency_s + (1 - alpha) * self.latency_ewma_s
+
+    def record_loss(self, elapsed_s: float, alpha: float = 0.3) -> None:
+        """
+        Record losing a race after `elapsed_s`, a lower bound on the provider's latency.
+
+        The estimate is only ever raised, so a provider that keeps losing ranks
+        behind the one that keeps winning.
+        """
+        if self.latency_ewma_s is None:
+            self.latency_ewma_s = elapsed_s
+        elif elapsed_s > self.latency_ewma_s:
+            self.latency_ewma_s = alpha * elapsed_s + (1 - alpha) * self.latency_ewma_s
+
+    def record_failure(self, now: float, failure_threshold: int, cooldown_s: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= failure_threshold:
+            self.open_until = now + cooldown_s
+
+
+class HedgedDownloader:
+    """
+    Download from the healthiest provider, hedging to the next one if it is slow.
+
+    The first provider starts immediately. If it has not finished after
+    `hedge_delay_s`, or as soon as it fails, the next provider starts as well.
+    The first successful download wins and the others are cancelled. Providers
+    that fail `failure_threshold` times in a row are skipped for `cooldown_s`.
+    """
+
+    def __init__(
+        self,
+        providers: List[DownloadProvider],
+        hedge_delay_s: float = DEFAULT_HEDGE_DELAY_S,
+        deadline_s: float = DEFAULT_DEADLINE_S,
+        failure_threshold: int = 3,
+        cooldown_s: float = 60.0,
+    ):
+        if not providers:
+            raise ValueError("At least one download provider is required")
+        self.providers = providers
+        self.hedge_delay_s = hedge_delay_s
+        self.deadline_s = deadline_s
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.health: Dict[str, ProviderHealth] = {p.name: ProviderHealth() for p in providers}
+        self._health_lock = threading.Lock()
+
+    def ranked_providers(self) -> List[DownloadProvider]:
+        """Available providers, fewest recent failures and lowest latency first (unknown latency last)."""
+        now = time.monotonic()
+        with self._health_lock:
+            available = [p for p in self.providers if self.health[p.name].is_available(now)]
+            return sorted(
+                available,
+                key=lambda p: (
+                    self.health[p.name].consecutive_failures,
+                    self.health[p.name].latency_ewma_s is None,
+                    self.health[p.name].latency_ewma_s or 0.0,
+                ),
+            )
+
+    def download(self, url: str, output):
+        """
+        Download `url` into `output` (a path or a writable binary file object).
+
+        Returns:
+            `output`
+
+        Raises:
+            RuntimeError: If every provider fails, all circuits are open or the
+                deadline is exceeded
+        """
+        providers = self.ranked_providers()
+        if not providers:
+            raise RuntimeError("All download providers are temporarily unavailable")
+
+        deadline = time.monotonic() + self.deadline_s
+        cancel = threading.Event()
+        running: Dict[Future, DownloadProvider] = {}
+        started: List[Future] = []
+        start_times: Dict[Future, float] = {}
+        # Providers whose outcome is already recorded, guarded by the health lock
+        settled: Set[str] = set()
+        errors: List[str] = []
+        executor = ThreadPoolExecutor(max_workers=len(providers))
+
+        def start_next() -> float:
+            provider = providers[len(started)]
+            logger.info("Starting download of %s with provider %s", url, provider.name)
+            future = executor.submit(self._attempt, provider, url, cancel, deadline, settled)
+            running[future] = provider
+            started.append(future)
+            start_times[future] = time.monotonic()
+            return time.monotonic() + self.hedge_delay_s
+
+        def settle_running(timed_out: bool) -> None:
+            """Record the outcome of providers still running when the download ends."""
+            now = time.monotonic()
+            with self._health_lock:
+                for future, provider in running.items():
+                    if future.done() or provider.name in settled:
+                        continue
+                    settled.add(provider.name)
+                    health = self.health[provider.name]
+                    if timed_out:
+                        health.record_failure(now, self.failure_threshold, self.cooldown_s)
+                    else:
+                        health.record_loss(now - start_times[future])
+
+        winner = None
+        try:
+            next_hedge = start_next()
+            while running:
+                now = time.monotonic()
+                if now >= deadline:
+                    # Hanging providers count as failed, so their circuit can open
+                    settle_running(timed_out=True)
+                    raise RuntimeError(f"Download timed out after {self.deadline_s:.0f}s")
+                can_hedge = len(started) < len(providers)
+                wake = min(deadline, next_hedge) if can_hedge else deadline
+                done, _ = wait(list(running), timeout=max(wake - now, 0), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    provider = running.pop(future)
+                    try:
+                        part_path = future.result()
+                    except Exception as e:
+                        logger.warning("Provider %s failed for %s: %s", provider.name, url, e)
+                        errors.append(f"{provider.name}: {e}")
+                        continue
+                    logger.info("Provider %s won the download of %s", provider.name, url)
+                    winner = future
+                    settle_running(timed_out=False)
+                    self._deliver(part_path, output)
+                    return output
+
+                # Hedge when the running providers are slow, or right away after a failure
+                if can_hedge and (done or time.monotonic() >= next_hedge):
+                    next_hedge = start_next()
+
+            raise RuntimeError(f"All download providers failed: {'; '.join(errors)}")
+        finally:
+            cancel.set()
+            for future in started:
+                if future is not winner:
+                    future.add_done_callback(_discard_part)
+            executor.shutdown(wait=False)
+
+    def _attempt(
+        self,
+        provider: DownloadProvider,
+        url: str,
+        cancel: threading.Event,
+        deadline: float,
+        settled: Set[str],
+    ) -> str:
+        """
+        Run one provider into its own temporary file and record its health.
+
+        Outcomes already recorded by `download` (a lost race or a timeout) are
+        not recorded again.
+        """
+        fd, part_path = tempfile.mkstemp(suffix=".part")
+        os.close(fd)
+        start = time.monotonic()
+        try:
+            provider.fetch(url, part_path, cancel, deadline)
+            if cancel.is_set():
+                raise DownloadCancelled(provider.name)
+        except BaseException:
+            Path(part_path).unlink(missing_ok=True)
+            with self._health_lock:
+                # Errors raised while being cancelled are not the provider's fault
+                if provider.name not in settled and not cancel.is_set():
+                    settled.add(provider.name)
+                    self.health[provider.name].record_failure(
+                        time.monotonic(), self.failure_threshold, self.cooldown_s
+                    )
+            raise
+
+        with self._health_lock:
+            if provider.name not in settled:
+                settled.add(provider.name)
+                self.health[provider.name].record_success(time.monotonic() - start)
+        return part_path
+
+    @staticmethod
+    def _deliver(part_path: str, output) -> None:
+        """Move the winning temporary file into `output`."""
+        try:
+            if isinstance(output, str):
+                try:
+                    os.replace(part_path, output)
+                except OSError:
+                    # Different filesystem: copy contents only, never permissions
+                    shutil.copyfile(part_path, output)
+            else:
+                with open(part_path, "rb") as f:
+                    shutil.copyfileobj(f, output)
+                output.flush()
+        finally:
+            Path(part_path).unlink(missing_ok=True)
+
+
+def _discard_part(future: Future) -> None:
+    """Remove the temporary file of a provider that finished after losing the race."""
+    if not future.cancelled() and future.exception() is None:
+        Path(future.result()).unlink(missing_ok=True)
@@ -1,73 +1,164 @@
+import threading
 import time
+from typing import Dict, Optional, Tuple
 
-import requests
+import yt_dlp
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
+from ...env import positive_env
+from ..hedged import (
+    DEFAULT_DEADLINE_S,
+    DEFAULT_HEDGE_DELAY_S,
+    DownloadCancelled,
+    DownloadProvider,
+    HedgedDownloader,
+    HttpProvider,
+)
 
-class TikTokDownloader:
 
-    @staticmethod
-    def download(url: str, output: str):
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            
+def _remaining_ms(deadline: float, cap_s: float) -> float:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("ssstik exceeded the download deadline")
+    return min(remaining, cap_s) * 1000
+
+
+def _check_cancel(cancel: threading.Event) -> None:
+    if cancel.is_set():
+        raise DownloadCancelled("ssstik")
+
+
+def resolve_ssstik(
+    url: str,
+    cancel: Optional[threading.Event] = None,
+    deadline: Optional[float] = None,
+) -> Tuple[str, Dict[str, str]]:
+    if cancel is None:
+        cancel = threading.Event()
+    if deadline is None:
+        deadline = time.monotonic() + 65
+    _check_cancel(cancel)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(
+            headless=True,
+            args=['--disable-blink-features=AutomationControlled'],
+            timeout=_remaining_ms(deadline, 30),
+        )
+
+        try:
             context = browser.new_context(
                 user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 viewport={'width': 1920, 'height': 1080}
             )
-            
+
             page = context.new_page()
-            
+
             page.add_init_script('''
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => undefined
                 });
             ''')
-            
+
+            _check_cancel(cancel)
+            page.goto("https://ssstik.io/it-1", timeout=_remaining_ms(deadline, 30))
+
+            _check_cancel(cancel)
             try:
-                page.goto("https://ssstik.io/it-1", timeout=30000)
-                
+                consent_btn = page.locator('button.fc-cta-consent').first
+                consent_btn.click(timeout=_remaining_ms(deadline, 5))
+                time.sleep(_remaining_ms(deadline, 1) / 1000)
+            except PlaywrightTimeoutError:
+                pass
+
+            _check_cancel(cancel)
+            input_field = page.locator('#main_page_text')
+            input_field.fill(url, timeout=_remaining_ms(deadline, 30))
+
+            download_button = page.locator('button[type="submit"]')
+            download_button.click(timeout=_remaining_ms(deadline, 30))
+
+            # Wait in short slices so a cancelled resolve closes the browser promptly
+            while True:
+                _check_cancel(cancel)
                 try:
-                    consent_btn = page.locator('button.fc-cta-consent').first
-                    consent_btn.click(timeout=5000)
-                    time.sleep(1)
+                    page.wait_for_selector(
+                        'a.download_link.without_watermark',
+                        timeout=_remaining_ms(deadline, 1),
+                    )
+                    break
                 except PlaywrightTimeoutError:
-                    pass
-                
-                input_field = page.locator('#main_page_text')
-                input_field.fill(url)
-                
-                download_button = page.locator('button[type="submit"]')
-                download_button.click()
-                
-                page.wait_for_selector('a.download_link.without_watermark', timeout=30000)
-                time.sleep(1)
-                
-                download_link = page.locator('a.download_link.without_watermark:not(.without_watermark_hd)').first
-                video_url = download_link.get_attribute('href')
-                
-                headers = {
-                    'Referer': 'https://ssstik.io/',
-                    'User-Agent': page.evaluate('() => navigator.userAgent')
-                }
-                
-                response = requests.get(video_url, stream=True, headers=headers)
-                response.raise_for_status()
-                
-                if isinstance(output, str):
-                    with open(output, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        output.write(chunk)
-                    output.flush()
-                
-            finally:
-                browser.close()
-        
-        return output
-        
\ No newline at end of file
+                    continue
+            time.sleep(_remaining_ms(deadline, 1) / 1000)
+            _check_cancel(cancel)
+
+            download_link = page.locator('a.download_link.without_watermark:not(.without_watermark_hd)').first
+            video_url = download_link.get_attribute('href', timeout=_remaining_ms(deadline, 5))
+
+            headers = {
+                'Referer': 'https://ssstik.io/',
+                'User-Agent': page.evaluate('() => navigator.userAgent')
+            }
+
+        finally:
+            browser.close()
+
+    return video_url, headers
+
+
+class SsstikProvider(HttpProvider):
+
+    def __init__(self):
+        super().__init__("ssstik", resolve_ssstik)
+
+    def resolve_media(self, url: str, cancel: threading.Event, deadline: float) -> Tuple[str, Dict[str, str]]:
+        return resolve_ssstik(url, cancel, deadline)
+
+
+class YtDlpProvider(DownloadProvider):
+
+    name = "yt-dlp"
+
+    def fetch(self, url: str, output_path: str, cancel: threading.Event, deadline: float) -> None:
+        def check_cancel(progress):
+            if cancel.is_set():
+                raise DownloadCancelled(self.name)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{self.name} exceeded the download deadline")
+
+        options = {
+            'outtmpl': output_path,
+            'format': 'best[ext=mp4]/best',
+            'overwrites': True,
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'socket_timeout': max(deadline - time.monotonic(), 1.0),
+            'progress_hooks': [check_cancel],
+        }
+        with yt_dlp.YoutubeDL(options) as ydl:
+            ydl.download([url])
+
+
+class TikTokDownloader:
+
+    _hedged: Optional[HedgedDownloader] = None
+    _hedged_lock = threading.Lock()
+
+    @classmethod
+    def hedged(cls) -> HedgedDownloader:
+        # Shared so provider health survives across downloads
+        with cls._hedged_lock:
+            if cls._hedged is None:
+                hedge_delay_s = positive_env("RECIPES_DOWNLOAD_HEDGE_DELAY_S", float)
+                deadline_s = positive_env("RECIPES_DOWNLOAD_DEADLINE_S", float)
+                cls._hedged = HedgedDownloader(
+                    [SsstikProvider(), YtDlpProvider()],
+                    hedge_delay_s=DEFAULT_HEDGE_DELAY_S if hedge_delay_s is None else hedge_delay_s,
+                    deadline_s=DEFAULT_DEADLINE_S if deadline_s is None else deadline_s,
+                )
+            return cls._hedged
+
+    @staticmethod
+    def download(url: str, output):
+        return TikTokDownloader.hedged().download(url, output)
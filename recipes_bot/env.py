@@ -0,0 +1,47 @@
+"""Parsing and validation of configuration environment variables."""
+
+import math
+import os
+from typing import Callable, Optional, TypeVar
+
+Number = TypeVar("Number", int, float)
+
+
+def positive_env(name: str, parse: Callable[[str], Number]) -> Optional[Number]:
+    """
+    Parse a positive number from environment variable `name`, or None if unset.
+
+    Raises:
+        ValueError: If the variable is set but is not a positive, finite number
+    """
+    raw = os.getenv(name)
+    if not raw:
+        return None
+    try:
+        value = parse(raw)
+    except ValueError:
+        value = None
+    if value is None or not math.isfinite(value) or value <= 0:
+        raise ValueError(
+            f"Invalid configuration: {name} must be a positive "
+            f"{'integer' if parse is int else 'number'}, got {raw!r}"
+        )
+    return value
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """
+    Parse a boolean environment variable such as "1", "true" or "no".
+
+    Raises:
+        ValueError: If the variable is set but is not a boolean
+    """
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    value = raw.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Invalid configuration: {name} must be a boolean (e.g. 1 or 0), got {raw!r}")
@@ -1,15 +1,27 @@
 """Text extraction from videos (audio transcription, OCR, etc.)."""
 
-from .audio import transcribe, transcribe_to_chunks
-from .models import Recipe, Source, TextChunk
+from .archive import TranscriptArchive
+from .audio import transcribe, transcribe_result, transcribe_to_chunks
+from .media import MediaLimits, preflight, probe_media
+from .ocr import ocr_to_chunks
+from .models import ChunkColumns, MediaInfo, Recipe, Source, TextChunk, Transcription
 from .recipe import extract_recipe, extract_recipe_from_url, extract_recipe_from_video
 
 __all__ = [
     "TextChunk",
+    "ChunkColumns",
+    "Transcription",
+    "TranscriptArchive",
     "Source",
     "Recipe",
+    "MediaInfo",
+    "MediaLimits",
+    "preflight",
+    "probe_media",
     "transcribe",
+    "transcribe_result",
     "transcribe_to_chunks",
+    "ocr_to_chunks",
     "extract_recipe",
     "extract_recipe_from_url",
     "extract_recipe_from_video",
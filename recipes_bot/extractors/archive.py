@@ -0,0 +1,198 @@
+"""Append-only, memory-mapped archive of transcripts stored as chunk columns."""
+
+import mmap
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from .models import ChunkColumns
+
+RECORD_MAGIC = b"TRC1"
+# magic, chunk count, text buffer size, key size
+_RECORD_HEADER = struct.Struct("<4sIII")
+
+
+def _pad8(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _column_bytes(typecode: str, column: Sequence) -> bytes:
+    """Raw bytes of a column, without conversion when it already has the right type."""
+    try:
+        view = memoryview(column)
+        if view.format == typecode:
+            return view.tobytes()
+    except TypeError:
+        pass
+    return array(typecode, column).tobytes()
+
+
+class TranscriptArchive:
+    """
+    Append-only file of transcripts, read back through a memory map.
+
+    Each record holds a key (e.g. the video URL) and the columns of a
+    ChunkColumns, each section padded to 8 bytes:
+
+        header: magic, chunk count n, text buffer size, key size
+        key: UTF-8
+        starts, ends, confidences: n x f64
+        offsets: (n + 1) x u32 into the text buffer
+        sources: n x u8
+        text buffer: UTF-8
+
+    Records read from the archive are ChunkColumns whose columns are
+    memoryviews into the mapped file, so nothing is copied until a chunk's
+    fields are accessed. They stay valid as long as they are referenced.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Archive file (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._mmap: Optional[mmap.mmap] = None
+        self._keys: Dict[str, int] = {}
+        self._scanned = 0
+
+    def append(self, key: str, chunks: ChunkColumns) -> None:
+        """
+        Append the transcript `chunks` under `key`.
+
+        The record is written with a single write. A torn record left at the end
+        of the file by an interrupted append is overwritten, so only one process
+        should append to an archive at a time.
+        """
+        n = len(chunks)
+        encoded_key = key.encode("utf-8")
+        # Columns sliced from a larger record point into its text buffer
+        base = chunks.offsets[0]
+        text_buffer = bytes(chunks.text_buffer[base:chunks.offsets[n]])
+        offsets = chunks.offsets if base == 0 else array("I", (offset - base for offset in chunks.offsets))
+
+        sections = [
+            encoded_key,
+            _column_bytes("d", chunks.starts),
+            _column_bytes("d", chunks.ends),
+            _column_bytes("d", chunks.confidences),
+            _column_bytes("I", offsets),
+            _column_bytes("B", chunks.sources),
+            text_buffer,
+        ]
+        record = bytearray(_RECORD_HEADER.pack(RECORD_MAGIC, n, len(text_buffer), len(encoded_key)))
+        for section in sections:
+            record += section
+            record += b"\0" * (_pad8(len(section)) - len(section))
+
+        end = self._scan(self._map())
+        with open(self.path, "r+b") as f:
+            f.seek(end)
+            f.write(record)
+            f.truncate()
+            f.flush()
+
+    def __iter__(self) -> Iterator[Tuple[str, ChunkColumns]]:
+        """Iterate over (key, chunks) for every complete record, oldest first."""
+        view = self._map()
+        for pos, _ in self._records(view, 0):
+            key, chunks, _ = self._read_record(view, pos)
+            yield key, chunks
+
+    def get(self, key: str) -> Optional[ChunkColumns]:
+        """Chunks most recently appended under `key`, or None."""
+        view = self._map()
+        self._scan(view)
+        if key not in self._keys:
+            return None
+        return self._read_record(view, self._keys[key])[1]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Records are still referenced; the map closes once they are released
+            self._mmap = None
+
+    def _map(self) -> memoryview:
+        """Map the archive, remapping if records were appended since the last read."""
+        size = self.path.stat().st_size
+        if size == 0:
+            return memoryview(b"")
+        if self._mmap is None or len(self._mmap) != size:
+            # The previous map stays alive while records read from it are referenced
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def _scan(self, view: memoryview) -> int:
+        """Index keys of records appended since the last scan; returns the end of the last complete record."""
+        for pos, end in self._records(view, self._scanned):
+            self._keys[self._read_key(view, pos)] = pos
+            self._scanned = end
+        return self._scanned
+
+    @staticmethod
+    def _record_size(view: memoryview, pos: int) -> Optional[int]:
+        """Size of the record at `pos`, or None if it is incomplete (torn or still being written)."""
+        if pos + _RECORD_HEADER.size > len(view):
+            return None
+        magic, n, text_size, key_size = _RECORD_HEADER.unpack_from(view, pos)
+        if magic != RECORD_MAGIC:
+            raise RuntimeError(f"Corrupt transcript archive record at byte {pos}")
+        size = (
+            _RECORD_HEADER.size
+            + _pad8(key_size)
+            + 3 * _pad8(8 * n)
+            + _pad8(4 * (n + 1))
+            + _pad8(n)
+            + _pad8(text_size)
+        )
+        if pos + size > len(view):
+            return None
+        return size
+
+    @classmethod
+    def _records(cls, view: memoryview, pos: int) -> Iterator[Tuple[int, int]]:
+        """(start, end) of each complete record from `pos`, stopping at an incomplete tail."""
+        while True:
+            size = cls._record_size(view, pos)
+            if size is None:
+                return
+            yield pos, pos + size
+            pos += size
+
+    @staticmethod
+    def _read_key(view: memoryview, pos: int) -> str:
+        key_size = _RECORD_HEADER.unpack_from(view, pos)[3]
+        start = pos + _RECORD_HEADER.size
+        return bytes(view[start:start + key_size]).decode("utf-8")
+
+    @staticmethod
+    def _read_record(view: memoryview, pos: int) -> Tuple[str, ChunkColumns, int]:
+        """Read the complete record at `pos` (checked with `_record_size` first)."""
+        magic, n, text_size, key_size = _RECORD_HEADER.unpack_from(view, pos)
+        if magic != RECORD_MAGIC:
+            raise RuntimeError(f"Corrupt transcript archive record at byte {pos}")
+        pos += _RECORD_HEADER.size
+
+        def take(size: int) -> memoryview:
+            nonlocal pos
+            section = view[pos:pos + size]
+            pos += _pad8(size)
+            return section
+
+        key = bytes(take(key_size)).decode("utf-8")
+        chunks = ChunkColumns(
+            starts=take(8 * n).cast("d"),
+            ends=take(8 * n).cast("d"),
+            confidences=take(8 * n).cast("d"),
+            offsets=take(4 * (n + 1)).cast("I"),
+            sources=take(n).cast("B"),
+            text_buffer=take(text_size),
+        )
+        return key, chunks, pos
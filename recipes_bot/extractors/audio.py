@@ -1,24 +1,217 @@
 """Audio extraction and transcription from video files."""
 
+import logging
 import subprocess
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 import tempfile
 
 import whisper
 
-from .models import TextChunk
+from ..env import env_flag
+from .media import require_binary
+from .models import ChunkColumns, TextChunk, Transcription
+
+logger = logging.getLogger(__name__)
+
+# Cache Whisper models by size after first load. Each size has its own load
+# lock, so a cold load never blocks requests for sizes already in memory.
+_models: Dict[str, Any] = {}
+_model_locks: Dict[str, threading.Lock] = {}
+_models_lock = threading.Lock()
+
+# Number of transcriptions currently running in this process
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+# Model used to detect the spoken language on the first 30s window
+DETECTION_MODEL = "tiny"
+
+
+def get_whisper_model(size: str = "small"):
+    """Get or load a Whisper model of the given size (cached after first load)."""
+    model = _models.get(size)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        load_lock = _model_locks.setdefault(size, threading.Lock())
+    # Only requests for this size wait while it loads (and possibly downloads)
+    with load_lock:
+        if size not in _models:
+            logger.info("Loading Whisper model %s", size)
+            _models[size] = whisper.load_model(size)
+        return _models[size]
+
+
+@dataclass
+class RoutingPolicy:
+    """Thresholds used to pick a Whisper model size per request."""
+
+    default_size: str = "small"
+    light_size: str = "base"
+    overload_size: str = "tiny"
+    short_clip_s: float = 60.0
+    busy_queue_depth: int = 2
+    overload_queue_depth: int = 4
+    english_only_models: bool = True
+    preload_all_models: bool = False
+
+    @classmethod
+    def from_env(cls) -> "RoutingPolicy":
+        """
+        Build a policy from environment variables, falling back to the defaults.
+
+        Reads `RECIPES_WHISPER_ENGLISH_ONLY` and `RECIPES_WHISPER_PRELOAD`.
+
+        Raises:
+            ValueError: If a variable is set to an invalid value
+        """
+        return cls(
+            english_only_models=env_flag("RECIPES_WHISPER_ENGLISH_ONLY", True),
+            preload_all_models=env_flag("RECIPES_WHISPER_PRELOAD", False),
+        )
+
+    def model_sizes(self) -> List[str]:
+        """Every Whisper model this policy can route to, plus the language detector."""
+        sizes = [DETECTION_MODEL]
+        for size in (self.overload_size, self.light_size, self.default_size):
+            candidates = [size]
+            if self.english_only_models and not size.startswith("large"):
+                candidates.append(f"{size}.en")
+            sizes.extend(candidate for candidate in candidates if candidate not in sizes)
+        return sizes
+
+    def preload_sizes(self) -> List[str]:
+        """Models to load at startup: every routed model if `preload_all_models`, else the detector and default size."""
+        if self.preload_all_models:
+            return self.model_sizes()
+        return list(dict.fromkeys([DETECTION_MODEL, self.default_size]))
+
+
+def preload_whisper_models(policy: Optional[RoutingPolicy] = None) -> None:
+    """
+    Load the models returned by `policy.preload_sizes()` before requests arrive.
+
+    By default only the language detector and the default size are loaded
+    (tiny and small, about 1.1 GB of fp32 weights). With `preload_all_models`
+    (`RECIPES_WHISPER_PRELOAD=1`) every model the router can pick is loaded, so
+    the smaller models picked under load are never cold-loaded during a spike.
+    With the default policy that keeps six models resident: tiny, base and
+    small plus their English-only variants, about 2.8 GB (~150 MB, ~290 MB and
+    ~970 MB each), or about 1.4 GB with `RECIPES_WHISPER_ENGLISH_ONLY=0`.
+
+    Args:
+        policy: Routing thresholds (default: `RoutingPolicy.from_env()`)
+    """
+    if policy is None:
+        policy = RoutingPolicy.from_env()
+    for size in policy.preload_sizes():
+        get_whisper_model(size)
+
+
+def choose_model_size(
+    duration_s: float,
+    language: str,
+    queue_depth: int,
+    policy: Optional[RoutingPolicy] = None,
+) -> str:
+    """
+    Pick a Whisper model size from clip duration, language and current load.
+
+    Smaller models are used under load and for short English clips, where they
+    lose little accuracy. English clips use the English-only variants, which are
+    more accurate than multilingual models of the same size.
+
+    Args:
+        duration_s: Audio duration in seconds
+        language: Detected language code (e.g. "en")
+        queue_depth: Number of other transcriptions running in this process
+        policy: Routing thresholds (default: `RoutingPolicy.from_env()`)
+
+    Returns:
+        Whisper model name to load (e.g. "base.en", "small")
+    """
+    if policy is None:
+        policy = RoutingPolicy.from_env()
+
+    if queue_depth >= policy.overload_queue_depth:
+        size = policy.overload_size
+    elif queue_depth >= policy.busy_queue_depth:
+        size = policy.light_size
+    elif language == "en" and duration_s <= policy.short_clip_s:
+        size = policy.light_size
+    else:
+        size = policy.default_size
+
+    # large models have no English-only variant
+    if language == "en" and policy.english_only_models and not size.startswith("large"):
+        size = f"{size}.en"
+    return size
+
 
-# Cache the Whisper model after first load
-_model = None
+def detect_language(audio) -> str:
+    """
+    Detect the spoken language once, on the first 30 second window of the audio.
+
+    Args:
+        audio: 16 kHz mono audio samples as returned by `whisper.load_audio`
+
+    Returns:
+        Most likely language code (e.g. "en")
+    """
+    model = get_whisper_model(DETECTION_MODEL)
+    window = whisper.pad_or_trim(audio)
+    mel = whisper.log_mel_spectrogram(window, model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+@contextmanager
+def _track_in_flight() -> Iterator[int]:
+    """Count a running transcription, yielding how many others were already running."""
+    global _in_flight
+    with _in_flight_lock:
+        queue_depth = _in_flight
+        _in_flight += 1
+    try:
+        yield queue_depth
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+
+
+def _run_whisper(audio_path: str, policy: Optional[RoutingPolicy] = None) -> Dict[str, Any]:
+    """
+    Transcribe a WAV file with a Whisper model routed for this request.
 
+    Args:
+        audio_path: Path to 16 kHz mono WAV file
+        policy: Routing thresholds (default: `RoutingPolicy.from_env()`)
+
+    Returns:
+        Raw Whisper result with "text" and "segments"
+    """
+    # Decode once and reuse the samples for detection and transcription
+    audio = whisper.load_audio(audio_path)
+    duration_s = len(audio) / whisper.audio.SAMPLE_RATE
+
+    with _track_in_flight() as queue_depth:
+        language = detect_language(audio)
+        model_size = choose_model_size(duration_s, language, queue_depth, policy)
+        logger.info(
+            "Whisper routing: model=%s language=%s duration=%.1fs queue_depth=%d",
+            model_size,
+            language,
+            duration_s,
+            queue_depth,
+        )
 
-def get_whisper_model():
-    """Get or load the Whisper model (cached after first load)."""
-    global _model
-    if _model is None:
-        _model = whisper.load_model("small")
-    return _model
+        model = get_whisper_model(model_size)
+        return model.transcribe(audio, language=language, fp16=False)
 
 
 def extract_audio_wav(video_path: str, output_path: str) -> str:
@@ -40,22 +233,7 @@ def extract_audio_wav(video_path: str, output_path: str) -> str:
     if not video.exists():
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
-    try:
-        subprocess.run(
-            ["ffmpeg", "-version"],
-            capture_output=True,
-            check=True,
-            timeout=5,
-        )
-    except (
-        FileNotFoundError,
-        subprocess.TimeoutExpired,
-        subprocess.CalledProcessError,
-    ) as e:
-        raise FileNotFoundError(
-            "ffmpeg is required but not found. Please install ffmpeg: "
-            "https://ffmpeg.org/download.html"
-        ) from e
+    require_binary("ffmpeg")
 
     # Extract audio: 16kHz mono WAV (optimal for Whisper)
     cmd = [
@@ -88,15 +266,15 @@ def extract_audio_wav(video_path: str, output_path: str) -> str:
     return str(output_path)
 
 
-def transcribe_to_chunks(video_path: str) -> List[TextChunk]:
+def transcribe_result(video_path: str) -> Transcription:
     """
-    Transcribe audio from video file and return timestamped text chunks.
+    Transcribe audio from video file once, keeping both the full text and the timestamped chunks.
 
     Args:
         video_path: Path to input video file (.mp4)
 
     Returns:
-        List of TextChunk objects with transcribed text and timestamps
+        Transcription with the full text, columnar chunks and detected language
 
     Raises:
         FileNotFoundError: If video file or ffmpeg not found
@@ -108,14 +286,11 @@ def transcribe_to_chunks(video_path: str) -> List[TextChunk]:
         extract_audio_wav(video_path, audio_path)
 
         try:
-            # Load model (cached after first load)
-            model = get_whisper_model()
+            # Transcribe with segments (model routed per request)
+            result = _run_whisper(audio_path)
 
-            # Transcribe with segments
-            result = model.transcribe(audio_path, fp16=False)
-
-            # Convert segments to TextChunk objects
-            chunks: List[TextChunk] = []
+            # Store segments column-wise instead of one object per segment
+            chunks = ChunkColumns()
             for segment in result.get("segments", []):
                 chunks.append(
                     TextChunk(
@@ -127,7 +302,11 @@ def transcribe_to_chunks(video_path: str) -> List[TextChunk]:
                     )
                 )
 
-            return chunks
+            return Transcription(
+                text=result.get("text", "").strip(),
+                chunks=chunks,
+                language=result.get("language"),
+            )
 
         except Exception as e:
             raise RuntimeError(f"Failed to transcribe audio: {e}") from e
@@ -141,42 +320,39 @@ def transcribe_to_chunks(video_path: str) -> List[TextChunk]:
                     pass  # Ignore cleanup errors
 
 
-def transcribe(video_path: str) -> str:
+def transcribe_to_chunks(video_path: str) -> List[TextChunk]:
     """
-    Transcribe audio from video file and return full transcript as text.
+    Transcribe audio from video file and return timestamped text chunks.
+
+    Use `transcribe_result` to get the text and the chunks from a single pass.
 
     Args:
         video_path: Path to input video file (.mp4)
 
     Returns:
-        Full transcript text as a single string
+        List of TextChunk objects with transcribed text and timestamps
 
     Raises:
         FileNotFoundError: If video file or ffmpeg not found
         RuntimeError: If transcription fails
     """
-    # Extract audio
-    with tempfile.NamedTemporaryFile(suffix=".wav") as temp_audio:
-        audio_path = temp_audio.name
-        extract_audio_wav(video_path, audio_path)
+    return transcribe_result(video_path).chunks.to_chunks()
 
-        try:
-            # Load model (cached after first load)
-            model = get_whisper_model()
 
-            # Transcribe
-            result = model.transcribe(audio_path, fp16=False)
+def transcribe(video_path: str) -> str:
+    """
+    Transcribe audio from video file and return full transcript as text.
 
-            # Return full text
-            return result.get("text", "").strip()
+    Use `transcribe_result` to get the text and the chunks from a single pass.
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to transcribe audio: {e}") from e
-        finally:
-            # Clean up temporary audio file
-            audio_file = Path(audio_path)
-            if audio_file.exists() and audio_file != Path(video_path):
-                try:
-                    audio_file.unlink()
-                except OSError:
-                    pass  # Ignore cleanup errors
+    Args:
+        video_path: Path to input video file (.mp4)
+
+    Returns:
+        Full transcript text as a single string
+
+    Raises:
+        FileNotFoundError: If video file or ffmpeg not found
+        RuntimeError: If transcription fails
+    """
+    return transcribe_result(video_path).text
@@ -0,0 +1,218 @@
+"""Media inspection and admission control before expensive extraction stages."""
+
+import json
+import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet, Optional
+
+from ..env import positive_env
+from .models import MediaInfo
+
+_MIB = 1024 * 1024
+
+
+@dataclass
+class MediaLimits:
+    """Admission limits checked by `preflight` before transcription starts."""
+
+    max_duration_s: float = 600.0
+    max_bytes: int = 200 * _MIB
+    require_audio: bool = True
+    allowed_audio_codecs: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def from_env(cls) -> "MediaLimits":
+        """
+        Build limits from environment variables, falling back to the defaults.
+
+        Reads `RECIPES_MAX_DURATION_S` and `RECIPES_MAX_BYTES`.
+
+        Raises:
+            ValueError: If a variable is set but is not a positive number
+        """
+        limits = cls()
+        max_duration = positive_env("RECIPES_MAX_DURATION_S", float)
+        if max_duration is not None:
+            limits.max_duration_s = max_duration
+        max_bytes = positive_env("RECIPES_MAX_BYTES", int)
+        if max_bytes is not None:
+            limits.max_bytes = max_bytes
+        return limits
+
+
+_INSTALL_HINTS = {
+    "ffmpeg": "https://ffmpeg.org/download.html",
+    "ffprobe": "https://ffmpeg.org/download.html",
+    "tesseract": "https://tesseract-ocr.github.io/tessdoc/Installation.html",
+}
+
+
+@lru_cache(maxsize=None)
+def has_binary(name: str, version_flag: str = "-version") -> bool:
+    """
+    Check once per process whether an external tool can be executed.
+
+    Args:
+        name: Executable name (e.g. "ffmpeg", "ffprobe")
+        version_flag: Flag that makes the tool print its version and exit
+
+    Returns:
+        True if the executable is on PATH and answers `version_flag`
+    """
+    if shutil.which(name) is None:
+        return False
+    try:
+        subprocess.run(
+            [name, version_flag],
+            capture_output=True,
+            check=True,
+            timeout=5,
+        )
+    except (
+        FileNotFoundError,
+        subprocess.TimeoutExpired,
+        subprocess.CalledProcessError,
+    ):
+        return False
+    return True
+
+
+def require_binary(name: str, version_flag: str = "-version") -> None:
+    """
+    Raise if an external tool required by the pipeline is not available.
+
+    Raises:
+        FileNotFoundError: If the executable cannot be run
+    """
+    if not has_binary(name, version_flag):
+        message = f"{name} is required but not found. Please install {name}"
+        if name in _INSTALL_HINTS:
+            message += f": {_INSTALL_HINTS[name]}"
+        raise FileNotFoundError(message)
+
+
+def probe_media(video_path: str) -> MediaInfo:
+    """
+    Read container and stream headers of a video file with ffprobe.
+
+    Only the headers are parsed, so this is cheap compared to decoding.
+
+    Args:
+        video_path: Path to input video file (.mp4)
+
+    Returns:
+        MediaInfo describing duration, size and codecs
+
+    Raises:
+        FileNotFoundError: If video file or ffprobe not found
+        RuntimeError: If ffprobe fails or returns unreadable output
+    """
+    video = Path(video_path)
+    if not video.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    require_binary("ffprobe")
+
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        str(video),
+    ]
+
+    try:
+        result = subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            timeout=30,
+        )
+        probe = json.loads(result.stdout)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to read video headers: {e}") from e
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Reading video headers timed out") from TimeoutError
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Failed to parse ffprobe output: {e}") from e
+
+    video_codec = None
+    audio_codec = None
+    for stream in probe.get("streams", []):
+        codec_type = stream.get("codec_type")
+        if codec_type == "video" and video_codec is None:
+            video_codec = stream.get("codec_name")
+        elif codec_type == "audio" and audio_codec is None:
+            audio_codec = stream.get("codec_name")
+
+    container = probe.get("format", {})
+    try:
+        duration_s = float(container.get("duration", 0.0))
+    except (TypeError, ValueError):
+        duration_s = 0.0
+
+    return MediaInfo(
+        duration_s=duration_s,
+        size_bytes=video.stat().st_size,
+        format_name=container.get("format_name", ""),
+        video_codec=video_codec,
+        audio_codec=audio_codec,
+    )
+
+
+def preflight(video_path: str, limits: Optional[MediaLimits] = None) -> MediaInfo:
+    """
+    Inspect a video and reject it before any expensive stage if it exceeds the limits.
+
+    The file size is checked before spawning ffprobe, so oversized uploads are
+    rejected without reading them.
+
+    Args:
+        video_path: Path to input video file (.mp4)
+        limits: Admission limits (default: `MediaLimits.from_env()`)
+
+    Returns:
+        MediaInfo of the admitted video
+
+    Raises:
+        FileNotFoundError: If video file or ffprobe not found
+        ValueError: If the video is rejected by the limits
+        RuntimeError: If the video headers cannot be read
+    """
+    if limits is None:
+        limits = MediaLimits.from_env()
+
+    video = Path(video_path)
+    if not video.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    size_bytes = video.stat().st_size
+    if size_bytes > limits.max_bytes:
+        raise ValueError(
+            f"Video is too large ({size_bytes / _MIB:.1f} MiB, "
+            f"limit {limits.max_bytes / _MIB:.1f} MiB)"
+        )
+
+    info = probe_media(video_path)
+
+    if info.duration_s > limits.max_duration_s:
+        raise ValueError(
+            f"Video is too long ({info.duration_s:.0f}s, "
+            f"limit {limits.max_duration_s:.0f}s)"
+        )
+    if limits.require_audio and not info.has_audio:
+        raise ValueError("Video has no audio track to transcribe")
+    if (
+        info.has_audio
+        and limits.allowed_audio_codecs is not None
+        and info.audio_codec not in limits.allowed_audio_codecs
+    ):
+        raise ValueError(f"Unsupported audio codec: {info.audio_codec}")
+
+    return info
@@ -1,7 +1,9 @@
 """Data models for text extraction from videos."""
 
+import math
+from array import array
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import Iterable, Iterator, List, Literal, Optional, Sequence, Union, overload
 
 Source = Literal["audio", "ocr"]
 
@@ -17,6 +19,130 @@ class TextChunk:
     confidence: Optional[float] = None
 
 
+# Source codes stored by ChunkColumns, indexed by position
+SOURCES = ("audio", "ocr")
+
+
+class ChunkColumns:
+    """
+    Compact, columnar storage for many text chunks.
+
+    Instead of one TextChunk object per segment, each field is one array:
+    start and end times, confidences (NaN when unknown), source codes, and
+    offsets into a single UTF-8 text buffer. Columns may be growable arrays
+    or read-only memoryviews over an archive file; TextChunk objects are only
+    built when items are accessed.
+    """
+
+    __slots__ = ("sources", "starts", "ends", "confidences", "offsets", "text_buffer")
+
+    def __init__(
+        self,
+        sources: Optional[Sequence[int]] = None,
+        starts: Optional[Sequence[float]] = None,
+        ends: Optional[Sequence[float]] = None,
+        confidences: Optional[Sequence[float]] = None,
+        offsets: Optional[Sequence[int]] = None,
+        text_buffer: Union[bytes, bytearray, memoryview, None] = None,
+    ):
+        self.sources = array("B") if sources is None else sources
+        self.starts = array("d") if starts is None else starts
+        self.ends = array("d") if ends is None else ends
+        self.confidences = array("d") if confidences is None else confidences
+        self.offsets = array("I", [0]) if offsets is None else offsets
+        self.text_buffer = bytearray() if text_buffer is None else text_buffer
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[TextChunk]) -> "ChunkColumns":
+        columns = cls()
+        for chunk in chunks:
+            columns.append(chunk)
+        return columns
+
+    def append(self, chunk: TextChunk) -> None:
+        """Append a chunk (only for columns backed by growable arrays)."""
+        self.sources.append(SOURCES.index(chunk.source))
+        self.starts.append(chunk.start_s)
+        self.ends.append(chunk.end_s)
+        self.confidences.append(math.nan if chunk.confidence is None else chunk.confidence)
+        self.text_buffer += chunk.text.encode("utf-8")
+        self.offsets.append(len(self.text_buffer))
+
+    def text(self, i: int) -> str:
+        """Text of chunk `i`, decoded from the shared buffer."""
+        return bytes(self.text_buffer[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, i: int) -> TextChunk: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> "ChunkColumns": ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._slice(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chunk index out of range")
+        confidence = self.confidences[i]
+        return TextChunk(
+            source=SOURCES[self.sources[i]],
+            start_s=self.starts[i],
+            end_s=self.ends[i],
+            text=self.text(i),
+            confidence=None if math.isnan(confidence) else confidence,
+        )
+
+    def __iter__(self) -> Iterator[TextChunk]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _slice(self, key: slice) -> "ChunkColumns":
+        """
+        Chunks selected by `key`. Contiguous slices of read-only columns (archive
+        records) share the mapped columns and text buffer; slices of growable
+        columns and stepped slices are copied, so appending to them is safe.
+        """
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            return ChunkColumns.from_chunks(self[i] for i in range(start, stop, step))
+        stop = max(start, stop)
+        if isinstance(self.text_buffer, bytearray):
+            base, end = self.offsets[start], self.offsets[stop]
+            return ChunkColumns(
+                sources=array("B", self.sources[start:stop]),
+                starts=array("d", self.starts[start:stop]),
+                ends=array("d", self.ends[start:stop]),
+                confidences=array("d", self.confidences[start:stop]),
+                offsets=array("I", (offset - base for offset in self.offsets[start:stop + 1])),
+                text_buffer=bytearray(self.text_buffer[base:end]),
+            )
+        return ChunkColumns(
+            sources=self.sources[start:stop],
+            starts=self.starts[start:stop],
+            ends=self.ends[start:stop],
+            confidences=self.confidences[start:stop],
+            offsets=self.offsets[start:stop + 1],
+            text_buffer=self.text_buffer,
+        )
+
+    def to_chunks(self) -> List[TextChunk]:
+        return list(self)
+
+
+@dataclass
+class Transcription:
+    """Result of a single transcription pass, from which text and chunks are derived."""
+    
+    text: str
+    chunks: ChunkColumns
+    language: Optional[str] = None
+
+
 @dataclass
 class Recipe:
     """Structured recipe information extracted from transcript."""
@@ -24,3 +150,19 @@ class Recipe:
     title: str
     ingredients: List[str]
     instructions: List[str]
+
+
+@dataclass
+class MediaInfo:
+    """Container and stream information read from video headers."""
+    
+    duration_s: float
+    size_bytes: int
+    format_name: str
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+
+    @property
+    def has_audio(self) -> bool:
+        """Whether the video contains an audio stream."""
+        return self.audio_codec is not None
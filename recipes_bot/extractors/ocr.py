@@ -0,0 +1,316 @@
+"""On-screen text extraction (OCR) from sampled video frames."""
+
+import difflib
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .media import probe_media, require_binary
+from .models import TextChunk
+
+_SCALE_FILTER = "scale='min(720,iw)':-2"
+
+
+def sample_frames(
+    video_path: str,
+    output_dir: str,
+    scene_threshold: float = 0.3,
+    min_interval_s: float = 0.5,
+    max_interval_s: float = 3.0,
+    max_frames: int = 60,
+    duration_s: Optional[float] = None,
+) -> List[Tuple[float, Path]]:
+    """
+    Decode only the frames worth reading: keyframes at scene changes plus seeked fill-ins.
+
+    Only keyframes are decoded (`-skip_frame nokey`). Encoders place keyframes at
+    scene cuts, so a keyframe is kept when its scene score against the previous
+    keyframe exceeds `scene_threshold`, or when the sampling interval has passed
+    since the last kept one. Where kept keyframes are further apart than the
+    interval, single frames are fetched by seeking, so static overlays are still
+    sampled at a low fixed rate. Frames are downscaled before being written to
+    keep OCR cheap.
+
+    The `max_frames` budget is spread over the whole clip: for clips longer than
+    `max_frames * max_interval_s` the intervals are widened, and if there are still
+    too many candidates they are thinned evenly over time.
+
+    Args:
+        video_path: Path to input video file (.mp4)
+        output_dir: Directory where the sampled PNG frames are written
+        scene_threshold: Scene change score (0-1) that triggers a sample
+        min_interval_s: Minimum spacing between two scene-change samples
+        max_interval_s: Maximum spacing between two samples (for short clips)
+        max_frames: Upper bound on the number of sampled frames
+        duration_s: Video duration if already known (default: read with ffprobe)
+
+    Returns:
+        List of (timestamp in seconds, frame path) tuples in time order
+
+    Raises:
+        FileNotFoundError: If video file, ffmpeg or ffprobe not found
+        RuntimeError: If ffmpeg fails to sample frames or times out
+    """
+    video = Path(video_path)
+    if not video.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    require_binary("ffmpeg")
+
+    if not duration_s:
+        duration_s = probe_media(video_path).duration_s
+    interval_s = max(max_interval_s, duration_s / max_frames)
+    # Allows up to about twice the budget in keyframes, thinned below
+    min_spacing_s = max(min_interval_s, duration_s / (2 * max_frames))
+
+    select = (
+        "isnan(prev_selected_t)"
+        f"+gte(t-prev_selected_t,{interval_s})"
+        f"+gt(scene,{scene_threshold})*gte(t-prev_selected_t,{min_spacing_s})"
+    )
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-skip_frame",
+        "nokey",  # Decode keyframes only
+        "-i",
+        str(video),
+        "-an",  # No audio
+        "-vf",
+        f"select='{select}',{_SCALE_FILTER}",
+        "-vsync",
+        "vfr",  # Only write the selected frames
+        # Name each written frame after its timestamp in milliseconds
+        "-enc_time_base",
+        "1/1000",
+        "-frame_pts",
+        "1",
+        str(Path(output_dir) / "key_%d.png"),
+    ]
+    _run_ffmpeg(cmd, timeout=300)  # 5 minute timeout
+
+    keyframes = sorted(
+        (max(int(path.stem.split("_", 1)[1]), 0) / 1000, path)
+        for path in Path(output_dir).glob("key_*.png")
+    )
+
+    boundaries = [timestamp for timestamp, _ in keyframes]
+    if duration_s > 0:
+        boundaries.append(duration_s)
+    candidates: List[Tuple[float, Optional[Path]]] = list(keyframes)
+    candidates.extend((t, None) for t in _gap_fill_times(boundaries, min_interval_s, interval_s))
+    candidates = _spread(sorted(candidates, key=lambda candidate: candidate[0]), max_frames)
+
+    samples: List[Tuple[float, Path]] = []
+    for i, (timestamp, frame_path) in enumerate(candidates, start=1):
+        if frame_path is None:
+            frame_path = Path(output_dir) / f"fill_{i:04d}.png"
+            cmd = [
+                "ffmpeg",
+                "-y",
+                "-ss",
+                f"{timestamp:.3f}",  # Input seek: decodes from the previous keyframe only
+                "-i",
+                str(video),
+                "-an",
+                "-frames:v",
+                "1",
+                "-vf",
+                _SCALE_FILTER,
+                str(frame_path),
+            ]
+            _run_ffmpeg(cmd, timeout=60)
+            if not frame_path.exists():
+                continue
+        samples.append((timestamp, frame_path))
+
+    return samples
+
+
+def _spread(items: List, count: int) -> List:
+    """Keep at most `count` items, evenly spaced and including the first and last."""
+    if len(items) <= count:
+        return items
+    if count <= 1:
+        return items[:count]
+    return [items[round(i * (len(items) - 1) / (count - 1))] for i in range(count)]
+
+
+def _gap_fill_times(boundaries: List[float], min_interval_s: float, max_interval_s: float) -> List[float]:
+    """
+    Timestamps that fill gaps longer than `max_interval_s` between sorted `boundaries`.
+
+    A fill-in closer than `min_interval_s` to the next boundary is skipped.
+    """
+    times: List[float] = []
+    previous = None
+    for boundary in boundaries:
+        t = 0.0 if previous is None else previous + max_interval_s
+        while t < boundary - min_interval_s:
+            times.append(t)
+            t += max_interval_s
+        previous = boundary
+    return times
+
+
+def _run_ffmpeg(cmd: List[str], timeout: int) -> str:
+    """Run ffmpeg and return its log output."""
+    try:
+        result = subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to sample frames from video: {e}") from e
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Frame sampling timed out") from TimeoutError
+    return result.stderr.decode("utf-8", errors="replace")
+
+
+def read_frame_text(frame_path: Path, min_confidence: float = 60.0) -> Tuple[str, Optional[float]]:
+    """
+    Run tesseract on a single frame and keep only confidently recognised words.
+
+    Args:
+        frame_path: Path to the frame image
+        min_confidence: Minimum tesseract word confidence (0-100) to keep a word
+
+    Returns:
+        Tuple of (recognised text with one line per text line, mean confidence in 0-1
+        or None when nothing was recognised)
+
+    Raises:
+        FileNotFoundError: If tesseract not found
+        RuntimeError: If tesseract fails or times out
+    """
+    require_binary("tesseract", version_flag="--version")
+
+    # psm 11: sparse text, which suits captions scattered over a video frame
+    cmd = ["tesseract", str(frame_path), "stdout", "--psm", "11", "tsv"]
+
+    try:
+        result = subprocess.run(
+            cmd,
+            check=True,
+            capture_output=True,
+            timeout=60,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to read text from frame: {e}") from e
+    except subprocess.TimeoutExpired:
+        raise RuntimeError("Reading text from frame timed out") from TimeoutError
+
+    lines: Dict[Tuple[str, str, str], List[str]] = {}
+    confidences: List[float] = []
+    rows = result.stdout.decode("utf-8", errors="replace").splitlines()
+    for row in rows[1:]:  # Skip TSV header
+        fields = row.split("\t")
+        if len(fields) < 12 or not fields[11].strip():
+            continue
+        try:
+            confidence = float(fields[10])
+        except ValueError:
+            continue
+        if confidence < min_confidence:
+            continue
+        # Group words by (block, paragraph, line)
+        lines.setdefault((fields[2], fields[3], fields[4]), []).append(fields[11].strip())
+        confidences.append(confidence)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    if not confidences:
+        return text, None
+    return text, sum(confidences) / len(confidences) / 100.0
+
+
+def collapse_repeated_chunks(chunks: List[TextChunk], similarity: float = 0.9) -> List[TextChunk]:
+    """
+    Merge consecutive chunks showing the same overlay text into a single chunk.
+
+    Text is compared after whitespace and case normalisation, with a fuzzy
+    match to absorb small OCR differences between frames.
+
+    Args:
+        chunks: Chunks in time order
+        similarity: Minimum similarity ratio (0-1) for two texts to be considered equal
+
+    Returns:
+        List of chunks where repeated overlays span the whole time they were visible
+    """
+    collapsed: List[TextChunk] = []
+    previous_key = None
+    for chunk in chunks:
+        key = " ".join(chunk.text.lower().split())
+        if not key:
+            previous_key = None
+            continue
+        if (
+            collapsed
+            and previous_key is not None
+            and difflib.SequenceMatcher(None, previous_key, key).ratio() >= similarity
+        ):
+            collapsed[-1].end_s = max(collapsed[-1].end_s, chunk.end_s)
+            continue
+        collapsed.append(
+            TextChunk(
+                source=chunk.source,
+                start_s=chunk.start_s,
+                end_s=chunk.end_s,
+                text=chunk.text,
+                confidence=chunk.confidence,
+            )
+        )
+        previous_key = key
+    return collapsed
+
+
+def ocr_to_chunks(
+    video_path: str,
+    max_interval_s: float = 3.0,
+    duration_s: Optional[float] = None,
+) -> List[TextChunk]:
+    """
+    Extract on-screen text from video file and return timestamped text chunks.
+
+    Args:
+        video_path: Path to input video file (.mp4)
+        max_interval_s: Maximum spacing between two sampled frames (for short clips)
+        duration_s: Video duration if already known (default: read with ffprobe)
+
+    Returns:
+        List of TextChunk objects with source "ocr", in time order
+
+    Raises:
+        FileNotFoundError: If video file, ffmpeg, ffprobe or tesseract not found
+        RuntimeError: If frame sampling or OCR fails
+    """
+    with tempfile.TemporaryDirectory() as frames_dir:
+        frames = sample_frames(
+            video_path,
+            frames_dir,
+            max_interval_s=max_interval_s,
+            duration_s=duration_s,
+        )
+
+        chunks: List[TextChunk] = []
+        for i, (start_s, frame_path) in enumerate(frames):
+            # A frame's text is assumed visible until the next sampled frame
+            if i + 1 < len(frames):
+                end_s = frames[i + 1][0]
+            else:
+                end_s = start_s + max_interval_s
+            text, confidence = read_frame_text(frame_path)
+            chunks.append(
+                TextChunk(
+                    source="ocr",
+                    start_s=start_s,
+                    end_s=end_s,
+                    text=text,
+                    confidence=confidence,
+                )
+            )
+
+    return collapse_repeated_chunks(chunks)
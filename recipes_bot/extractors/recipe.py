@@ -1,26 +1,47 @@
 """Recipe extraction from transcript text using LLM."""
 
 import json
+import logging
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from openai import OpenAI
 
-from .models import Recipe
-from .audio import transcribe
+from .models import Recipe, TextChunk
+from .audio import transcribe, transcribe_to_chunks
+from .media import MediaLimits, has_binary, preflight
+from .ocr import ocr_to_chunks
 from ..downloaders.tiktok import TikTokDownloader
+from ..search import get_default_index
 
+logger = logging.getLogger(__name__)
 
-def extract_recipe(transcript: str, output_path: str, model: str = "gpt-4o-mini") -> Recipe:
+# OCR only drives ffmpeg and tesseract subprocesses, so threads are enough to
+# overlap it with transcription
+_ocr_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr")
+
+
+def extract_recipe(
+    transcript: str,
+    output_path: str,
+    model: str = "gpt-4o-mini",
+    source_url: Optional[str] = None,
+) -> Recipe:
     """
     Extract structured recipe information from transcript text using LLM.
     
+    When `RECIPES_INDEX_DIR` is set, the recipe is also added to the search index,
+    unless a recipe with the same content or `source_url` is already indexed.
+    
     Args:
         transcript: Recipe transcript text from video
         output_path: Path where the Markdown recipe file will be saved
         model: OpenAI model to use (default: gpt-4o-mini)
+        source_url: Video URL the transcript came from, used to skip duplicates in the index
         
     Returns:
         Recipe object with extracted information
@@ -48,6 +69,7 @@ Extract:
 3. Step-by-step instructions in order
 
 Handle common transcript issues like filler words, repetitions, and incomplete sentences.
+Lines starting with [on-screen text] were read from text overlays in the video and often contain exact quantities.
 Return the result as JSON with keys: "title", "ingredients" (array of strings), and "instructions" (array of strings)."""
     
     user_prompt = f"""Extract the recipe information from this transcript:
@@ -100,6 +122,8 @@ Return only valid JSON with the structure:
         output_file.parent.mkdir(parents=True, exist_ok=True)
         output_file.write_text(markdown_content, encoding="utf-8")
         
+        _index_recipe(recipe, source_url)
+        
         return recipe
         
     except json.JSONDecodeError as e:
@@ -110,25 +134,75 @@ Return only valid JSON with the structure:
         raise RuntimeError(f"Failed to extract recipe from transcript: {e}") from e
 
 
-def extract_recipe_from_video(video_path: str, output_path: str, model: str = "gpt-4o-mini") -> Recipe:
+def _index_recipe(recipe: Recipe, source_url: Optional[str] = None) -> None:
+    """
+    Add a recipe to the search index, if enabled.
+    
+    Indexing is best-effort: the recipe was already extracted and saved, so
+    index errors (disk full, permissions, a corrupt segment) are only logged.
+    """
+    try:
+        index = get_default_index()
+        if index is not None:
+            index.add(recipe, source_url)
+    except Exception:
+        logger.warning("Failed to add recipe %r to the search index", recipe.title, exc_info=True)
+
+
+def extract_recipe_from_video(
+    video_path: str,
+    output_path: str,
+    model: str = "gpt-4o-mini",
+    limits: Optional[MediaLimits] = None,
+    ocr: bool = True,
+    source_url: Optional[str] = None,
+) -> Recipe:
     """
     Extract recipe from video by transcribing audio and extracting structured recipe information.
     
+    The video is checked against `limits` before transcription starts. When `ocr` is
+    enabled and tesseract is installed, on-screen text is read in a background thread
+    while the audio is transcribed, and both are merged in timestamp order. Videos
+    without an audio track are then accepted and read from their on-screen text only.
+    
     Args:
         video_path: Path to input video file (.mp4)
         output_path: Path where the Markdown recipe file will be saved
         model: OpenAI model to use for extraction (default: gpt-4o-mini)
+        limits: Admission limits for the video (default: `MediaLimits.from_env()`)
+        ocr: Whether to also extract on-screen text (default: True)
+        source_url: Video URL, used to skip duplicates in the search index
         
     Returns:
         Recipe object with extracted information
         
     Raises:
         FileNotFoundError: If video file not found
-        ValueError: If transcript is empty or API key is missing
+        ValueError: If the video is rejected, transcript is empty or API key is missing
         RuntimeError: If transcription or extraction fails
     """
-    transcript = transcribe(video_path)
-    return extract_recipe(transcript, output_path, model)
+    use_ocr = ocr and has_binary("tesseract", "--version")
+    if not use_ocr:
+        preflight(video_path, limits)
+        transcript = transcribe(video_path)
+        return extract_recipe(transcript, output_path, model, source_url=source_url)
+
+    if limits is None:
+        limits = MediaLimits.from_env()
+    info = preflight(video_path, replace(limits, require_audio=False))
+
+    ocr_future = _ocr_pool.submit(ocr_to_chunks, video_path, duration_s=info.duration_s)
+    audio_chunks = transcribe_to_chunks(video_path) if info.has_audio else []
+    try:
+        ocr_chunks = ocr_future.result()
+    except RuntimeError:
+        if not audio_chunks:
+            raise
+        logger.warning("OCR failed for %s, using audio only", video_path, exc_info=True)
+        ocr_chunks = []
+
+    transcript = _format_chunks_as_transcript(_merge_chunks(audio_chunks, ocr_chunks))
+    return extract_recipe(transcript, output_path, model, source_url=source_url)
 
 
 def extract_recipe_from_url(url: str, output_path: str, model: str = "gpt-4o-mini") -> Recipe:
@@ -145,7 +219,7 @@ def extract_recipe_from_url(url: str, output_path: str, model: str = "gpt-4o-min
         
     Raises:
         FileNotFoundError: If video download fails
-        ValueError: If transcript is empty or API key is missing
+        ValueError: If the video is rejected, transcript is empty or API key is missing
         RuntimeError: If transcription or extraction fails
     """
     temp_video_path = None
@@ -154,7 +228,7 @@ def extract_recipe_from_url(url: str, output_path: str, model: str = "gpt-4o-min
             temp_video_path = temp_file.name
         
         TikTokDownloader.download(url, temp_video_path)
-        return extract_recipe_from_video(temp_video_path, output_path, model)
+        return extract_recipe_from_video(temp_video_path, output_path, model, source_url=url)
     finally:
         if temp_video_path:
             Path(temp_video_path).unlink(missing_ok=True)
@@ -190,3 +264,41 @@ def _format_recipe_as_markdown(recipe: Recipe) -> str:
         lines.append(f"{i}. {instruction}")
     
     return "\n".join(lines)
+
+
+
+def _merge_chunks(*chunk_lists: List[TextChunk]) -> List[TextChunk]:
+    """
+    Merge chunks from several sources into a single list in timestamp order.
+    
+    Args:
+        chunk_lists: Lists of chunks, each in time order
+        
+    Returns:
+        All chunks sorted by start time (audio before OCR on ties)
+    """
+    chunks = [chunk for chunk_list in chunk_lists for chunk in chunk_list]
+    return sorted(chunks, key=lambda chunk: (chunk.start_s, chunk.source != "audio"))
+
+
+def _format_chunks_as_transcript(chunks: List[TextChunk]) -> str:
+    """
+    Format merged chunks as transcript text for the LLM.
+    
+    Args:
+        chunks: Chunks in timestamp order
+        
+    Returns:
+        Transcript with one line per chunk, on-screen text marked as such
+    """
+    lines = []
+    for chunk in chunks:
+        text = " ".join(chunk.text.split())
+        if not text:
+            continue
+        if chunk.source == "ocr":
+            lines.append(f"[on-screen text] {text}")
+        else:
+            lines.append(text)
+    
+    return "\n".join(lines)
@@ -0,0 +1,8 @@
+"""Search over previously extracted recipes."""
+
+from .index import RecipeIndex, get_default_index
+
+__all__ = [
+    "RecipeIndex",
+    "get_default_index",
+]
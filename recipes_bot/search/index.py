@@ -0,0 +1,446 @@
+"""Incremental inverted index over extracted recipes, memory-mapped from disk."""
+
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..extractors.models import Recipe
+
+# Field prefixes used in index keys, and their weight when ranking matches
+FIELD_WEIGHTS = (("t", 3), ("i", 2), ("s", 1))
+
+SEGMENT_MAGIC = b"RIDX0001"
+# magic, doc count, term count
+_HEADER = struct.Struct("<8sII")
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens of at least two characters."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) >= 2]
+
+
+def _recipe_keys(recipe: Recipe) -> List[str]:
+    """Index keys ("<field>:<token>") of a recipe, one per distinct token per field."""
+    fields = (
+        ("t", [recipe.title]),
+        ("i", recipe.ingredients),
+        ("s", recipe.instructions),
+    )
+    keys = set()
+    for field, texts in fields:
+        for text in texts:
+            keys.update(f"{field}:{token}" for token in tokenize(text))
+    return sorted(keys)
+
+
+def _dedup_keys(recipe: Recipe, source_url: Optional[str] = None) -> List[str]:
+    """
+    Index keys ("k:<hash>") identifying a recipe for deduplication.
+
+    One key hashes the normalised title and ingredients; another hashes the
+    source URL when it is known, so resending a link matches even when the
+    extracted text differs slightly.
+    """
+    content = json.dumps(
+        [" ".join(tokenize(recipe.title)), sorted(" ".join(tokenize(ing)) for ing in recipe.ingredients)],
+        ensure_ascii=False,
+    )
+    sources = [content]
+    if source_url:
+        sources.append(source_url.strip())
+    return [f"k:{hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]}" for source in sources]
+
+
+class _Segment:
+    """
+    Read-only, memory-mapped base segment.
+
+    Layout (little-endian, 4-byte aligned):
+        header: magic, doc count, term count
+        term offsets: (term count + 1) x u32 into the terms blob
+        posting offsets: (term count + 1) x u32 into the postings array
+        terms blob: sorted UTF-8 keys, padded to 4 bytes
+        postings: u32 doc ids, sorted within each term
+    """
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.doc_count, self.term_count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SEGMENT_MAGIC:
+            self.close()
+            raise RuntimeError(f"Not a recipe index segment: {path}")
+
+        self._view = view = memoryview(self._mmap)
+        n = self.term_count + 1
+        pos = _HEADER.size
+        self._term_offsets = view[pos:pos + 4 * n].cast("I")
+        pos += 4 * n
+        self._posting_offsets = view[pos:pos + 4 * n].cast("I")
+        pos += 4 * n
+        terms_size = self._term_offsets[-1]
+        self._terms = view[pos:pos + terms_size]
+        pos += _pad4(terms_size)
+        self._postings = view[pos:pos + 4 * self._posting_offsets[-1]].cast("I")
+
+    @classmethod
+    def empty(cls) -> "_Segment":
+        segment = cls.__new__(cls)
+        segment._file = None
+        segment._mmap = None
+        segment._view = None
+        segment.doc_count = 0
+        segment.term_count = 0
+        segment._term_offsets = array("I", [0])
+        segment._posting_offsets = array("I", [0])
+        segment._terms = memoryview(b"")
+        segment._postings = array("I")
+        return segment
+
+    def term(self, i: int) -> bytes:
+        return bytes(self._terms[self._term_offsets[i]:self._term_offsets[i + 1]])
+
+    def postings(self, i: int):
+        return self._postings[self._posting_offsets[i]:self._posting_offsets[i + 1]]
+
+    def lower_bound(self, key: bytes) -> int:
+        """Index of the first term >= `key` (binary search on the sorted terms)."""
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def prefix_range(self, prefix: bytes) -> range:
+        """Indices of all terms starting with `prefix`."""
+        start = end = self.lower_bound(prefix)
+        while end < self.term_count and self.term(end).startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def find(self, key: bytes) -> Optional[int]:
+        i = self.lower_bound(key)
+        if i < self.term_count and self.term(i) == key:
+            return i
+        return None
+
+    def close(self) -> None:
+        # Views must be released before the mmap can be closed
+        for name in ("_term_offsets", "_posting_offsets", "_terms", "_postings", "_view"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _pad4(size: int) -> int:
+    return (size + 3) & ~3
+
+
+def _score_tiers(matches: List[Tuple[int, Sequence[int]]]) -> Dict[int, Set[int]]:
+    """Docs in `matches` grouped by their best score, using set operations done in C."""
+    by_score: Dict[int, List[Sequence[int]]] = {}
+    for score, postings in matches:
+        by_score.setdefault(score, []).append(postings)
+
+    tiers: Dict[int, Set[int]] = {}
+    seen: Set[int] = set()
+    for score in sorted(by_score, reverse=True):
+        docs = set().union(*by_score[score]) - seen
+        if docs:
+            tiers[score] = docs
+            seen |= docs
+    return tiers
+
+
+def _probe_tiers(candidates: Set[int], matches: List[Tuple[int, Sequence[int]]]) -> Dict[int, Set[int]]:
+    """Like `_score_tiers`, restricted to a few candidates found by binary search."""
+    tiers: Dict[int, Set[int]] = {}
+    for doc_id in candidates:
+        best = 0
+        for score, postings in matches:
+            i = bisect_left(postings, doc_id)
+            if score > best and i < len(postings) and postings[i] == doc_id:
+                best = score
+        if best:
+            tiers.setdefault(best, set()).add(doc_id)
+    return tiers
+
+
+class RecipeIndex:
+    """
+    Inverted index over recipe titles, ingredients and instructions.
+
+    Recipes are appended to `recipes.jsonl` (with their byte offsets in
+    `recipes.off`) and indexed in memory. A recipe whose content or source
+    URL is already indexed is skipped. Every `compact_every` new recipes,
+    the in-memory postings are merged into `segment.bin`, which is
+    memory-mapped, so opening the index only re-reads recipes added since
+    the last merge.
+    """
+
+    def __init__(self, index_dir: str, compact_every: int = 1000):
+        """
+        Args:
+            index_dir: Directory holding the index files (created if missing)
+            compact_every: Number of new recipes kept in memory before merging them to disk
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+
+        self._docs_path = self.index_dir / "recipes.jsonl"
+        self._offsets_path = self.index_dir / "recipes.off"
+        self._segment_path = self.index_dir / "segment.bin"
+
+        self._docs = open(self._docs_path, "ab+")
+        self._offsets = open(self._offsets_path, "ab+")
+        self._segment = _Segment(self._segment_path) if self._segment_path.exists() else _Segment.empty()
+        self._delta: Dict[str, array] = {}
+
+        self._doc_count = self._offsets_path.stat().st_size // 8
+        # Drop a partial offset left behind if a crash interrupted `add`
+        self._offsets.truncate(self._doc_count * 8)
+        # Index recipes appended after the last merge
+        for doc_id in range(self._segment.doc_count, self._doc_count):
+            data = self._read_record(doc_id)
+            self._index_in_memory(doc_id, _recipe_from_record(data), data.get("source_url"))
+
+    def __len__(self) -> int:
+        return self._doc_count
+
+    def add(self, recipe: Recipe, source_url: Optional[str] = None) -> int:
+        """
+        Append a recipe to the index, unless it is already indexed.
+
+        Args:
+            recipe: Recipe to index
+            source_url: Video URL the recipe was extracted from, if known
+
+        Returns:
+            Id of the new recipe, or of the already indexed copy
+        """
+        data = {
+            "title": recipe.title,
+            "ingredients": recipe.ingredients,
+            "instructions": recipe.instructions,
+        }
+        if source_url:
+            data["source_url"] = source_url
+        record = json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n"
+
+        with self._lock:
+            for key in _dedup_keys(recipe, source_url):
+                existing = self._lookup(key)
+                if existing is not None:
+                    return existing
+
+            self._docs.seek(0, os.SEEK_END)
+            offset = self._docs.tell()
+            self._docs.write(record)
+            self._docs.flush()
+            self._offsets.write(struct.pack("<Q", offset))
+            self._offsets.flush()
+
+            doc_id = self._doc_count
+            self._doc_count += 1
+            self._index_in_memory(doc_id, recipe, source_url)
+            if self._doc_count - self._segment.doc_count >= self.compact_every:
+                self._compact()
+            return doc_id
+
+    def search(self, query: str, limit: int = 5) -> List[Recipe]:
+        """
+        Find recipes matching every word of `query`.
+
+        Words of three or more characters also match as prefixes (e.g. "tomato"
+        matches "tomatoes"). Matches in titles rank above ingredients, which rank
+        above instructions, and exact words above prefixes; ties go to the most
+        recently added recipe.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of recipes to return
+
+        Returns:
+            Matching recipes, best first
+        """
+        tokens = sorted(set(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            matches = {token: list(self._matches(token)) for token in tokens}
+            sizes = {token: sum(len(postings) for _, postings in matches[token]) for token in tokens}
+
+            # Docs grouped by total score; start from the rarest word to keep them few
+            tiers: Optional[Dict[int, Set[int]]] = None
+            for token in sorted(tokens, key=sizes.get):
+                if tiers is None:
+                    tiers = _score_tiers(matches[token])
+                    continue
+                candidates = sum(len(docs) for docs in tiers.values())
+                if candidates * 16 < sizes[token]:
+                    token_tiers = _probe_tiers(set().union(*tiers.values()), matches[token])
+                else:
+                    token_tiers = _score_tiers(matches[token])
+                merged: Dict[int, Set[int]] = {}
+                for score, docs in tiers.items():
+                    for token_score, token_docs in token_tiers.items():
+                        both = docs & token_docs
+                        if both:
+                            merged.setdefault(score + token_score, set()).update(both)
+                tiers = merged
+                if not tiers:
+                    return []
+
+            best: List[int] = []
+            for score in sorted(tiers, reverse=True):
+                best.extend(heapq.nlargest(limit - len(best), tiers[score]))
+                if len(best) >= limit:
+                    break
+            return [self._read_recipe(doc_id) for doc_id in best]
+
+    def compact(self) -> None:
+        """Merge in-memory postings into the on-disk segment."""
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        with self._lock:
+            self._segment.close()
+            self._docs.close()
+            self._offsets.close()
+
+    def _matches(self, token: str) -> Iterator[Tuple[int, Sequence[int]]]:
+        """Posting lists of every key matching `token`, with the score of that match."""
+        for field, weight in FIELD_WEIGHTS:
+            key = f"{field}:{token}"
+            encoded = key.encode("utf-8")
+            if len(token) >= 3:
+                for i in self._segment.prefix_range(encoded):
+                    exact = self._segment.term(i) == encoded
+                    yield 2 * weight - (not exact), self._segment.postings(i)
+                for delta_key, doc_ids in self._delta.items():
+                    if delta_key.startswith(key):
+                        yield 2 * weight - (delta_key != key), doc_ids
+            else:
+                i = self._segment.find(encoded)
+                if i is not None:
+                    yield 2 * weight, self._segment.postings(i)
+                if key in self._delta:
+                    yield 2 * weight, self._delta[key]
+
+    def _lookup(self, key: str) -> Optional[int]:
+        """Most recent doc id indexed under exact `key`, or None."""
+        if key in self._delta:
+            return self._delta[key][-1]
+        i = self._segment.find(key.encode("utf-8"))
+        if i is not None:
+            return self._segment.postings(i)[-1]
+        return None
+
+    def _index_in_memory(self, doc_id: int, recipe: Recipe, source_url: Optional[str] = None) -> None:
+        for key in _recipe_keys(recipe) + _dedup_keys(recipe, source_url):
+            self._delta.setdefault(key, array("I")).append(doc_id)
+
+    def _read_recipe(self, doc_id: int) -> Recipe:
+        return _recipe_from_record(self._read_record(doc_id))
+
+    def _read_record(self, doc_id: int) -> Dict:
+        # A record ends where the next one starts, or at the end of the file
+        if doc_id + 1 < self._doc_count:
+            start, end = struct.unpack("<QQ", os.pread(self._offsets.fileno(), 16, doc_id * 8))
+        else:
+            (start,) = struct.unpack("<Q", os.pread(self._offsets.fileno(), 8, doc_id * 8))
+            end = os.fstat(self._docs.fileno()).st_size
+        record = os.pread(self._docs.fileno(), end - start, start)
+        # Ignore a partial record left behind if a crash interrupted `add`
+        return json.loads(record.split(b"\n", 1)[0])
+
+    def _compact(self) -> None:
+        if not self._delta:
+            return
+
+        segment = self._segment
+        base_keys = {segment.term(i).decode("utf-8"): i for i in range(segment.term_count)}
+        keys = sorted(set(base_keys) | set(self._delta))
+        encoded_keys = [key.encode("utf-8") for key in keys]
+
+        term_offsets = array("I", [0])
+        posting_offsets = array("I", [0])
+        for key, encoded in zip(keys, encoded_keys):
+            term_offsets.append(term_offsets[-1] + len(encoded))
+            count = len(self._delta.get(key, ()))
+            if key in base_keys:
+                count += len(segment.postings(base_keys[key]))
+            posting_offsets.append(posting_offsets[-1] + count)
+
+        terms_blob = b"".join(encoded_keys)
+        tmp_path = self._segment_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(SEGMENT_MAGIC, self._doc_count, len(keys)))
+            f.write(term_offsets.tobytes())
+            f.write(posting_offsets.tobytes())
+            f.write(terms_blob)
+            f.write(b"\0" * (_pad4(len(terms_blob)) - len(terms_blob)))
+            for key in keys:
+                # Delta ids are all newer than base ids, so concatenation stays sorted
+                if key in base_keys:
+                    f.write(segment.postings(base_keys[key]).tobytes())
+                if key in self._delta:
+                    f.write(self._delta[key].tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self._segment_path)
+        segment.close()
+        self._segment = _Segment(self._segment_path)
+        self._delta = {}
+
+
+def _recipe_from_record(data: Dict) -> Recipe:
+    return Recipe(
+        title=data["title"],
+        ingredients=data["ingredients"],
+        instructions=data["instructions"],
+    )
+
+
+_default_index: Optional[RecipeIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_default_index() -> Optional[RecipeIndex]:
+    """
+    Get the process-wide index stored in `RECIPES_INDEX_DIR` (opened on first use).
+
+    Returns:
+        RecipeIndex, or None if `RECIPES_INDEX_DIR` is not set
+    """
+    global _default_index
+    index_dir = os.getenv("RECIPES_INDEX_DIR")
+    if not index_dir:
+        return None
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = RecipeIndex(index_dir)
+        return _default_index
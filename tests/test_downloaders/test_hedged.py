@@ -0,0 +1,211 @@
+import pathlib
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from recipes_bot.downloaders.hedged import DownloadCancelled, DownloadProvider, HedgedDownloader, HttpProvider
+
+PAYLOAD = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 4096
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD, with latency or failures injected by path (/slow/<seconds>, /fail)."""
+
+    def do_GET(self):
+        if self.path.startswith("/fail"):
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.path.startswith("/slow/"):
+            time.sleep(float(self.path.split("/")[2]))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        try:
+            self.wfile.write(PAYLOAD)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def provider(name, url):
+    return HttpProvider(name, lambda _: (url, {}))
+
+
+def test_fast_primary_is_not_hedged(stand_in):
+    downloader = HedgedDownloader(
+        [provider("primary", f"{stand_in}/ok"), provider("secondary", f"{stand_in}/ok")],
+        hedge_delay_s=5.0,
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = str(pathlib.Path(tmpdir) / "video.mp4")
+        assert downloader.download("https://example.com/video", output) == output
+        assert pathlib.Path(output).read_bytes() == PAYLOAD
+
+    assert downloader.health["primary"].successes == 1
+    assert downloader.health["secondary"].successes == 0
+
+
+def test_slow_primary_is_hedged(stand_in):
+    """Test that a slow provider is raced by the next one after the hedge delay."""
+    downloader = HedgedDownloader(
+        [provider("slow", f"{stand_in}/slow/3"), provider("fast", f"{stand_in}/ok")],
+        hedge_delay_s=0.2,
+    )
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        start = time.monotonic()
+        downloader.download("https://example.com/video", output)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 2.0, f"Hedged download should not wait for the slow provider, took {elapsed:.1f}s"
+        assert pathlib.Path(output.name).read_bytes() == PAYLOAD
+    assert downloader.health["fast"].successes == 1
+
+
+def test_failure_starts_next_provider_immediately(stand_in):
+    downloader = HedgedDownloader(
+        [provider("broken", f"{stand_in}/fail"), provider("backup", f"{stand_in}/ok")],
+        hedge_delay_s=10.0,
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = str(pathlib.Path(tmpdir) / "video.mp4")
+        start = time.monotonic()
+        downloader.download("https://example.com/video", output)
+
+        assert time.monotonic() - start < 2.0, "Should not wait for the hedge delay after a failure"
+        assert pathlib.Path(output).read_bytes() == PAYLOAD
+    assert downloader.health["broken"].consecutive_failures == 1
+
+
+def test_circuit_breaker_skips_failing_provider(stand_in):
+    downloader = HedgedDownloader(
+        [provider("broken", f"{stand_in}/fail"), provider("backup", f"{stand_in}/ok")],
+        failure_threshold=1,
+        cooldown_s=60.0,
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = str(pathlib.Path(tmpdir) / "video.mp4")
+        downloader.download("https://example.com/video", output)
+        assert [p.name for p in downloader.ranked_providers()] == ["backup"]
+
+        downloader.download("https://example.com/video", output)
+
+    assert downloader.health["broken"].failures == 1, "Open circuit should not be tried again"
+    assert downloader.health["backup"].successes == 2
+
+
+def test_healthier_provider_is_ranked_first(stand_in):
+    downloader = HedgedDownloader(
+        [provider("broken", f"{stand_in}/fail"), provider("backup", f"{stand_in}/ok")],
+        failure_threshold=3,
+    )
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        downloader.download("https://example.com/video", output)
+    assert [p.name for p in downloader.ranked_providers()] == ["backup", "broken"]
+
+
+def test_losing_provider_is_ranked_behind_winner(stand_in):
+    """Test that a provider that loses the race records its elapsed time and ranks last."""
+    downloader = HedgedDownloader(
+        [provider("slow", f"{stand_in}/slow/2"), provider("fast", f"{stand_in}/ok")],
+        hedge_delay_s=0.2,
+    )
+    assert [p.name for p in downloader.ranked_providers()] == ["slow", "fast"]
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        downloader.download("https://example.com/video", output)
+
+    assert downloader.health["slow"].latency_ewma_s >= 0.2, "A lost race is a lower bound on latency"
+    assert downloader.health["slow"].failures == 0, "Losing a race is not a failure"
+    assert [p.name for p in downloader.ranked_providers()] == ["fast", "slow"]
+
+
+def test_unknown_latency_is_ranked_last(stand_in):
+    downloader = HedgedDownloader([provider("new", f"{stand_in}/ok"), provider("known", f"{stand_in}/ok")])
+    downloader.health["known"].record_success(1.5)
+    assert [p.name for p in downloader.ranked_providers()] == ["known", "new"]
+
+
+def test_hanging_provider_opens_circuit(stand_in):
+    """Test that a provider still running at the deadline counts as failed."""
+    downloader = HedgedDownloader(
+        [provider("hanging", f"{stand_in}/slow/3")],
+        deadline_s=0.5,
+        failure_threshold=2,
+    )
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="timed out"):
+                downloader.download("https://example.com/video", output)
+
+        assert downloader.health["hanging"].failures == 2
+        assert downloader.ranked_providers() == []
+        with pytest.raises(RuntimeError, match="temporarily unavailable"):
+            downloader.download("https://example.com/video", output)
+
+
+class BlockingResolveProvider(HttpProvider):
+    """Resolves only once cancelled, recording whether the cancel event reached it."""
+
+    def __init__(self, name):
+        super().__init__(name, lambda _: ("", {}))
+        self.saw_cancel = threading.Event()
+
+    def resolve_media(self, url, cancel, deadline):
+        if cancel.wait(timeout=max(deadline - time.monotonic(), 0)):
+            self.saw_cancel.set()
+            raise DownloadCancelled(self.name)
+        raise TimeoutError("deadline")
+
+
+def test_losing_resolver_is_cancelled(stand_in):
+    """Test that a provider still resolving when another wins sees the cancel event."""
+    slow = BlockingResolveProvider("browser")
+    downloader = HedgedDownloader([slow, provider("fast", f"{stand_in}/ok")], hedge_delay_s=0.1)
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        downloader.download("https://example.com/video", output)
+
+    assert slow.saw_cancel.wait(1.0), "The losing provider should be cancelled, not left running"
+    assert downloader.health["browser"].failures == 0, "Cancellation is not a provider failure"
+
+
+def test_download_provider_is_abstract():
+    with pytest.raises(TypeError):
+        DownloadProvider()
+
+
+def test_all_providers_fail(stand_in):
+    downloader = HedgedDownloader(
+        [provider("a", f"{stand_in}/fail"), provider("b", f"{stand_in}/fail")],
+    )
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        with pytest.raises(RuntimeError, match="All download providers failed"):
+            downloader.download("https://example.com/video", output)
+
+
+def test_deadline_exceeded(stand_in):
+    downloader = HedgedDownloader(
+        [provider("slow", f"{stand_in}/slow/3")],
+        deadline_s=0.5,
+    )
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as output:
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="timed out"):
+            downloader.download("https://example.com/video", output)
+        assert time.monotonic() - start < 2.0
@@ -1,6 +1,7 @@
 import pathlib
 import os
 import tempfile
+import threading
 import pytest
 from recipes_bot import TikTokDownloader
 
@@ -31,3 +32,26 @@ def test_tiktok_downloader():
     finally:
         if temp_path.exists():
             temp_path.unlink()
+
+
+def test_hedged_downloader_is_shared(monkeypatch):
+    """Test that concurrent first downloads share one downloader, and its health data."""
+    monkeypatch.setattr(TikTokDownloader, "_hedged", None)
+    monkeypatch.setenv("RECIPES_DOWNLOAD_HEDGE_DELAY_S", "2.5")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(TikTokDownloader.hedged())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(downloader) for downloader in results}) == 1
+    assert results[0].hedge_delay_s == 2.5
+
+
+@pytest.mark.parametrize("value", ["soon", "-1", "0"])
+def test_hedged_downloader_rejects_invalid_env(monkeypatch, value):
+    monkeypatch.setattr(TikTokDownloader, "_hedged", None)
+    monkeypatch.setenv("RECIPES_DOWNLOAD_DEADLINE_S", value)
+    with pytest.raises(ValueError, match="Invalid configuration: RECIPES_DOWNLOAD_DEADLINE_S"):
+        TikTokDownloader.hedged()
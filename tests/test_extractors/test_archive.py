@@ -0,0 +1,110 @@
+"""Tests for columnar chunk storage and the transcript archive."""
+
+import pathlib
+import tempfile
+
+from recipes_bot.extractors.archive import TranscriptArchive
+from recipes_bot.extractors.models import ChunkColumns, TextChunk
+
+CHUNKS = [
+    TextChunk(source="audio", start_s=0.0, end_s=2.5, text="Add the orzo"),
+    TextChunk(source="ocr", start_s=1.0, end_s=4.0, text="200g orzo", confidence=0.9),
+    TextChunk(source="audio", start_s=2.5, end_s=5.0, text="and stir in the crème fraîche"),
+]
+
+
+def test_chunk_columns_round_trip():
+    columns = ChunkColumns.from_chunks(CHUNKS)
+
+    assert len(columns) == 3
+    assert columns.to_chunks() == CHUNKS
+    assert columns[-1] == CHUNKS[-1]
+    assert columns.text(2) == "and stir in the crème fraîche"
+
+
+def test_chunk_columns_slicing():
+    columns = ChunkColumns.from_chunks(CHUNKS)
+
+    assert isinstance(columns[1:], ChunkColumns)
+    assert columns[1:].to_chunks() == CHUNKS[1:]
+    assert columns[:-1].to_chunks() == CHUNKS[:-1]
+    assert columns[::2].to_chunks() == CHUNKS[::2]
+    assert len(columns[5:]) == 0
+
+
+def test_appending_to_slice_leaves_parent_intact():
+    """Test that a slice of growable columns does not share its text buffer with the parent."""
+    columns = ChunkColumns.from_chunks(CHUNKS)
+    head = columns[:1]
+    head.append(TextChunk(source="ocr", start_s=5.0, end_s=6.0, text="ZZZ"))
+    columns.append(TextChunk(source="audio", start_s=6.0, end_s=7.0, text="ccc"))
+
+    assert head.to_chunks() == [CHUNKS[0], TextChunk(source="ocr", start_s=5.0, end_s=6.0, text="ZZZ")]
+    assert columns.to_chunks()[:3] == CHUNKS
+    assert columns.text(3) == "ccc"
+    assert columns[1:].text(0) == CHUNKS[1].text
+
+
+def test_archive_append_and_read():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir) / "transcripts.bin"
+        archive = TranscriptArchive(str(path))
+        archive.append("video-1", ChunkColumns.from_chunks(CHUNKS))
+        archive.append("video-2", ChunkColumns.from_chunks(CHUNKS[:1]))
+        archive.append("empty", ChunkColumns())
+
+        records = list(archive)
+        assert [key for key, _ in records] == ["video-1", "video-2", "empty"]
+        assert records[0][1].to_chunks() == CHUNKS
+        assert len(records[2][1]) == 0
+        assert isinstance(records[0][1].starts, memoryview), "Records should be read without copying"
+
+        # Appending after a read remaps the file
+        archive.append("video-3", ChunkColumns.from_chunks(CHUNKS[1:]))
+        assert archive.get("video-3").to_chunks() == CHUNKS[1:]
+        assert archive.get("missing") is None
+        archive.close()
+
+        reopened = TranscriptArchive(str(path))
+        assert reopened.get("video-2").to_chunks() == CHUNKS[:1]
+        # Records copied from one archive to another keep their content
+        reopened.append("copy", reopened.get("video-1"))
+        assert reopened.get("copy").to_chunks() == CHUNKS
+        reopened.close()
+
+
+def test_archive_stops_at_torn_record():
+    """Test that a record cut short by an interrupted append is not read, and is overwritten."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir) / "transcripts.bin"
+        archive = TranscriptArchive(str(path))
+        archive.append("v1", ChunkColumns.from_chunks(CHUNKS[:1]))
+        archive.append("v2", ChunkColumns.from_chunks(CHUNKS[1:2]))
+        archive.close()
+        size = path.stat().st_size
+
+        for torn_bytes in (10, 60):
+            with open(path, "r+b") as f:
+                f.truncate(size - torn_bytes)
+
+            archive = TranscriptArchive(str(path))
+            assert [key for key, _ in archive] == ["v1"], "A torn trailing record should be skipped"
+            assert archive.get("v1").to_chunks() == CHUNKS[:1]
+            assert archive.get("v2") is None
+            archive.close()
+
+        archive = TranscriptArchive(str(path))
+        archive.append("v3", ChunkColumns.from_chunks(CHUNKS[2:]))
+        assert [key for key, _ in archive] == ["v1", "v3"], "Appending should replace the torn record"
+        assert archive.get("v3").to_chunks() == CHUNKS[2:]
+        archive.close()
+
+
+def test_archive_append_sliced_record():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive = TranscriptArchive(str(pathlib.Path(tmpdir) / "transcripts.bin"))
+        archive.append("video-1", ChunkColumns.from_chunks(CHUNKS))
+        archive.append("tail", archive.get("video-1")[1:])
+
+        assert archive.get("tail").to_chunks() == CHUNKS[1:]
+        archive.close()
@@ -4,10 +4,21 @@ import pathlib
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 
 import pytest
 
-from recipes_bot.extractors.audio import extract_audio_wav, transcribe, transcribe_to_chunks
+from recipes_bot.extractors import audio as audio_module
+from recipes_bot.extractors.audio import (
+    RoutingPolicy,
+    choose_model_size,
+    get_whisper_model,
+    extract_audio_wav,
+    transcribe,
+    transcribe_result,
+    transcribe_to_chunks,
+)
 from recipes_bot.extractors.models import TextChunk
 
 def test_ffmpeg_available():
@@ -92,7 +103,87 @@ def test_transcribe():
         assert len(transcript.strip()) > 0, "Transcript should not be empty"
 
 
+def test_transcribe_result():
+    """Test that a single pass yields both the full text and the chunks."""
+    fixture_video = pathlib.Path(__file__).parent.parent / "fixture/test_video.mp4"
+
+    result = transcribe_result(str(fixture_video))
+    assert len(result.text.strip()) > 0, "Transcript should not be empty"
+    assert len(result.chunks) > 0, "Should return at least one chunk"
+    assert result.language is not None, "Language should be detected"
+    for chunk in result.chunks:
+        assert chunk.text in result.text, "Chunk text should come from the transcript"
+
+
 def test_transcribe_nonexistent_file():
     """Test that transcribe raises error for nonexistent file."""
     with pytest.raises(FileNotFoundError):
         transcribe("nonexistent_video.mp4")
+
+
+def test_choose_model_size_short_english_clip():
+    assert choose_model_size(20.0, "en", queue_depth=0) == "base.en"
+    assert choose_model_size(20.0, "es", queue_depth=0) == "small"
+    assert choose_model_size(300.0, "en", queue_depth=0) == "small.en"
+
+
+def test_choose_model_size_under_load():
+    """Test that smaller models are picked as more transcriptions run at once."""
+    policy = RoutingPolicy(busy_queue_depth=2, overload_queue_depth=4)
+    assert choose_model_size(300.0, "es", queue_depth=1, policy=policy) == "small"
+    assert choose_model_size(300.0, "es", queue_depth=2, policy=policy) == "base"
+    assert choose_model_size(300.0, "es", queue_depth=4, policy=policy) == "tiny"
+
+
+def test_choose_model_size_without_english_only_models():
+    policy = RoutingPolicy(english_only_models=False, default_size="large")
+    assert choose_model_size(20.0, "en", queue_depth=0, policy=policy) == "base"
+    assert choose_model_size(300.0, "en", queue_depth=0, policy=policy) == "large"
+
+
+def test_routing_policy_model_sizes(monkeypatch):
+    assert RoutingPolicy().model_sizes() == ["tiny", "tiny.en", "base", "base.en", "small", "small.en"]
+    assert RoutingPolicy(english_only_models=False).model_sizes() == ["tiny", "base", "small"]
+
+    monkeypatch.setenv("RECIPES_WHISPER_ENGLISH_ONLY", "0")
+    assert RoutingPolicy.from_env().model_sizes() == ["tiny", "base", "small"]
+    monkeypatch.setenv("RECIPES_WHISPER_ENGLISH_ONLY", "maybe")
+    with pytest.raises(ValueError, match="RECIPES_WHISPER_ENGLISH_ONLY"):
+        RoutingPolicy.from_env()
+
+
+def test_routing_policy_preload_sizes(monkeypatch):
+    """Test that only the detector and default size are preloaded unless all models are opted in."""
+    assert RoutingPolicy().preload_sizes() == ["tiny", "small"]
+
+    monkeypatch.setenv("RECIPES_WHISPER_PRELOAD", "1")
+    assert RoutingPolicy.from_env().preload_sizes() == RoutingPolicy().model_sizes()
+
+
+def test_cold_model_load_does_not_block_cached_models(monkeypatch):
+    """Test that loading one model size does not hold up requests for a cached size."""
+    loading = threading.Event()
+    release = threading.Event()
+
+    def load_model(size):
+        if size == "small":
+            loading.set()
+            release.wait(5)
+        return f"model-{size}"
+
+    monkeypatch.setattr(audio_module, "_models", {"tiny": "model-tiny"})
+    monkeypatch.setattr(audio_module, "_model_locks", {})
+    monkeypatch.setattr(audio_module.whisper, "load_model", load_model, raising=False)
+
+    cold = threading.Thread(target=get_whisper_model, args=("small",))
+    cold.start()
+    assert loading.wait(5)
+    try:
+        start = time.monotonic()
+        assert get_whisper_model("tiny") == "model-tiny"
+        assert get_whisper_model("base") == "model-base", "Other sizes should load concurrently"
+        assert time.monotonic() - start < 1.0
+    finally:
+        release.set()
+        cold.join()
+    assert get_whisper_model("small") == "model-small"
@@ -0,0 +1,72 @@
+"""Tests for media inspection and admission control."""
+
+import pathlib
+
+import pytest
+
+from recipes_bot.extractors.media import MediaLimits, has_binary, preflight, probe_media
+from recipes_bot.extractors.models import MediaInfo
+
+fixture_video = pathlib.Path(__file__).parent.parent / "fixture/test_video.mp4"
+
+
+def test_has_binary_is_cached():
+    """Test that the capability probe only runs once per binary."""
+    has_binary.cache_clear()
+    assert has_binary("ffmpeg")
+    assert has_binary("ffmpeg")
+    assert has_binary.cache_info().hits == 1
+    assert not has_binary("definitely-not-a-real-binary")
+
+
+def test_probe_media():
+    """Test that ffprobe reads duration, size and codecs from the headers."""
+    info = probe_media(str(fixture_video))
+
+    assert isinstance(info, MediaInfo)
+    assert info.duration_s > 0, "Duration should be positive"
+    assert info.size_bytes == fixture_video.stat().st_size
+    assert info.video_codec is not None, "Fixture should have a video stream"
+    assert info.has_audio, "Fixture should have an audio stream"
+
+
+def test_probe_media_nonexistent_file():
+    with pytest.raises(FileNotFoundError):
+        probe_media("nonexistent_video.mp4")
+
+
+def test_preflight_admits_fixture():
+    info = preflight(str(fixture_video), MediaLimits())
+    assert info.has_audio
+
+
+def test_preflight_rejects_long_video():
+    with pytest.raises(ValueError, match="too long"):
+        preflight(str(fixture_video), MediaLimits(max_duration_s=0.5))
+
+
+def test_preflight_rejects_large_video():
+    with pytest.raises(ValueError, match=r"too large \(.* MiB, limit 0\.0 MiB\)"):
+        preflight(str(fixture_video), MediaLimits(max_bytes=1024))
+
+
+def test_preflight_rejects_audio_codec():
+    limits = MediaLimits(allowed_audio_codecs=frozenset({"not-a-codec"}))
+    with pytest.raises(ValueError, match="Unsupported audio codec"):
+        preflight(str(fixture_video), limits)
+
+
+def test_media_limits_from_env(monkeypatch):
+    monkeypatch.setenv("RECIPES_MAX_DURATION_S", "90")
+    monkeypatch.setenv("RECIPES_MAX_BYTES", "1000")
+    limits = MediaLimits.from_env()
+    assert limits.max_duration_s == 90.0
+    assert limits.max_bytes == 1000
+
+
+@pytest.mark.parametrize("name,value", [("RECIPES_MAX_DURATION_S", "ten"), ("RECIPES_MAX_BYTES", "200MB")])
+def test_media_limits_from_env_invalid(monkeypatch, name, value):
+    """Test that a malformed limit names the variable instead of a bare conversion error."""
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=f"Invalid configuration: {name}"):
+        MediaLimits.from_env()
@@ -0,0 +1,114 @@
+"""Tests for on-screen text extraction."""
+
+import pathlib
+import subprocess
+import tempfile
+
+import pytest
+
+from recipes_bot.extractors.media import has_binary
+from recipes_bot.extractors.models import TextChunk
+from recipes_bot.extractors.ocr import (
+    _gap_fill_times,
+    _spread,
+    collapse_repeated_chunks,
+    ocr_to_chunks,
+    sample_frames,
+)
+
+fixture_video = pathlib.Path(__file__).parent.parent / "fixture/test_video.mp4"
+
+
+def test_sample_frames():
+    """Test that frames are sampled sparsely and in time order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames = sample_frames(str(fixture_video), tmpdir, max_interval_s=3.0, max_frames=20)
+
+        assert 0 < len(frames) <= 20, "Should sample a bounded number of frames"
+        assert frames[0][0] < 1.0, "First frame should always be sampled"
+        for timestamp, frame_path in frames:
+            assert frame_path.exists(), "Sampled frame should be written"
+        for i in range(1, len(frames)):
+            assert frames[i][0] > frames[i-1][0], "Frames should be in chronological order"
+
+
+def test_sample_frames_fills_sparse_keyframes():
+    """Test that gaps between keyframes longer than max_interval_s are filled by seeking."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        frames = sample_frames(str(fixture_video), tmpdir, max_interval_s=1.0)
+
+        timestamps = [timestamp for timestamp, _ in frames]
+        assert timestamps[0] == 0.0
+        assert len(timestamps) >= 3, "A 3s clip sampled every second should have fill-in frames"
+        for i in range(1, len(timestamps)):
+            assert timestamps[i] - timestamps[i-1] <= 1.0 + 1e-6, "No gap should exceed max_interval_s"
+
+
+def test_sample_frames_spreads_budget_over_long_clip():
+    """Test that a clip longer than max_frames * max_interval_s is sampled to its end."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        video = pathlib.Path(tmpdir) / "long.mp4"
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-f", "lavfi", "-i", "testsrc=size=64x64:rate=5",
+                "-t", "240", "-g", "5", "-pix_fmt", "yuv420p", str(video),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        frames_dir = pathlib.Path(tmpdir) / "frames"
+        frames_dir.mkdir()
+
+        frames = sample_frames(str(video), str(frames_dir), max_interval_s=3.0, max_frames=20, duration_s=240.0)
+
+        timestamps = [timestamp for timestamp, _ in frames]
+        assert len(frames) <= 20
+        assert timestamps == sorted(timestamps)
+        assert timestamps[-1] > 200.0, "The end of the clip should still be sampled"
+
+
+def test_spread():
+    assert _spread(list(range(5)), 10) == list(range(5))
+    assert _spread(list(range(10)), 4) == [0, 3, 6, 9]
+    assert _spread(list(range(10)), 1) == [0]
+
+
+def test_gap_fill_times():
+    assert _gap_fill_times([0.0, 1.0, 10.0], min_interval_s=0.5, max_interval_s=3.0) == [4.0, 7.0]
+    assert _gap_fill_times([2.0], min_interval_s=0.5, max_interval_s=3.0) == [0.0], "Leading gap is filled from 0"
+    assert _gap_fill_times([0.0, 3.2], min_interval_s=0.5, max_interval_s=3.0) == [], "Fill-in too close to the next keyframe"
+    assert _gap_fill_times([], min_interval_s=0.5, max_interval_s=3.0) == []
+
+
+def test_sample_frames_nonexistent_file():
+    with pytest.raises(FileNotFoundError):
+        sample_frames("nonexistent_video.mp4", "/tmp")
+
+
+def test_collapse_repeated_chunks():
+    """Test that identical overlay text across consecutive frames becomes one chunk."""
+    chunks = [
+        TextChunk(source="ocr", start_s=0.0, end_s=2.0, text="200g  flour"),
+        TextChunk(source="ocr", start_s=2.0, end_s=4.0, text="200G flour"),
+        TextChunk(source="ocr", start_s=4.0, end_s=6.0, text=""),
+        TextChunk(source="ocr", start_s=6.0, end_s=8.0, text="2 eggs"),
+        TextChunk(source="ocr", start_s=8.0, end_s=10.0, text="2 eggs"),
+    ]
+
+    collapsed = collapse_repeated_chunks(chunks)
+
+    assert [chunk.text for chunk in collapsed] == ["200g  flour", "2 eggs"]
+    assert (collapsed[0].start_s, collapsed[0].end_s) == (0.0, 4.0)
+    assert (collapsed[1].start_s, collapsed[1].end_s) == (6.0, 10.0)
+    assert chunks[0].end_s == 2.0, "Input chunks should not be modified"
+
+
+@pytest.mark.skipif(not has_binary("tesseract", "--version"), reason="tesseract not installed")
+def test_ocr_to_chunks():
+    chunks = ocr_to_chunks(str(fixture_video))
+
+    assert isinstance(chunks, list), "Should return a list"
+    for chunk in chunks:
+        assert chunk.source == "ocr", "Source should be 'ocr'"
+        assert chunk.end_s > chunk.start_s, "end_s should be greater than start_s"
+        assert len(chunk.text.strip()) > 0, "text should not be empty"
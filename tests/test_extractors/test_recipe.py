@@ -1,6 +1,10 @@
 import os
+
 import pytest
-from recipes_bot.extractors.recipe import extract_recipe
+from recipes_bot.extractors import recipe as recipe_module
+from recipes_bot.extractors.media import MediaLimits
+from recipes_bot.extractors.models import MediaInfo, Recipe, TextChunk
+from recipes_bot.extractors.recipe import _format_chunks_as_transcript, _merge_chunks, extract_recipe
 
 
 def test_openai_syntesises_transcript():
@@ -10,3 +14,66 @@ def test_openai_syntesises_transcript():
     assert recipe is not None
     assert len(recipe.title) > 5
     assert len(recipe.ingredients) == 12
+
+
+def test_merge_chunks_and_format_transcript():
+    """Test that audio and on-screen text are interleaved in timestamp order for the LLM."""
+    audio = [
+        TextChunk(source="audio", start_s=0.0, end_s=3.0, text="First add the  orzo"),
+        TextChunk(source="audio", start_s=3.0, end_s=6.0, text="then the stock"),
+    ]
+    ocr = [
+        TextChunk(source="ocr", start_s=0.0, end_s=2.0, text="200g\norzo"),
+        TextChunk(source="ocr", start_s=2.0, end_s=4.0, text="   "),
+        TextChunk(source="ocr", start_s=4.0, end_s=6.0, text="500ml stock"),
+    ]
+
+    merged = _merge_chunks(audio, ocr)
+
+    assert [chunk.start_s for chunk in merged] == [0.0, 0.0, 2.0, 3.0, 4.0]
+    assert merged[0].source == "audio", "Audio should come first on equal timestamps"
+    assert _format_chunks_as_transcript(merged) == (
+        "First add the orzo\n"
+        "[on-screen text] 200g orzo\n"
+        "then the stock\n"
+        "[on-screen text] 500ml stock"
+    )
+
+
+def test_silent_video_is_read_from_on_screen_text(monkeypatch):
+    """Test that a video without audio skips transcription and uses OCR only."""
+    silent = MediaInfo(duration_s=10.0, size_bytes=1000, format_name="mp4", video_codec="h264", audio_codec=None)
+    transcripts = []
+
+    def fail_transcription(video_path):
+        raise AssertionError("A silent video should not be transcribed")
+
+    monkeypatch.setattr(recipe_module, "has_binary", lambda *args: True)
+    monkeypatch.setattr(recipe_module, "preflight", lambda video_path, limits: silent)
+    monkeypatch.setattr(recipe_module, "transcribe_to_chunks", fail_transcription)
+    monkeypatch.setattr(
+        recipe_module,
+        "ocr_to_chunks",
+        lambda video_path, duration_s: [TextChunk(source="ocr", start_s=1.0, end_s=3.0, text="2 eggs")],
+    )
+    monkeypatch.setattr(
+        recipe_module,
+        "extract_recipe",
+        lambda transcript, output_path, model, source_url: transcripts.append(transcript),
+    )
+
+    recipe_module.extract_recipe_from_video("silent.mp4", "recipe.md", limits=MediaLimits())
+
+    assert transcripts == ["[on-screen text] 2 eggs"]
+
+
+def test_index_errors_do_not_fail_extraction(monkeypatch, caplog):
+    """Test that a broken search index is logged instead of failing an extracted recipe."""
+    def broken_index():
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(recipe_module, "get_default_index", broken_index)
+
+    recipe_module._index_recipe(Recipe(title="Tomato Salad", ingredients=["tomatoes"], instructions=["Slice."]))
+
+    assert "Failed to add recipe 'Tomato Salad' to the search index" in caplog.text
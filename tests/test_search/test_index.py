@@ -0,0 +1,88 @@
+import tempfile
+
+from recipes_bot.extractors.models import Recipe
+from recipes_bot.search import RecipeIndex
+
+ORZO = Recipe(
+    title="Lemon Chicken Orzo",
+    ingredients=["2 chicken breasts", "200g orzo", "1 lemon"],
+    instructions=["Sear the chicken.", "Simmer the orzo in stock."],
+)
+SALAD = Recipe(
+    title="Tomato Salad",
+    ingredients=["4 tomatoes", "basil", "olive oil"],
+    instructions=["Slice the tomatoes and dress with oil."],
+)
+SOUP = Recipe(
+    title="Chicken Soup",
+    ingredients=["1 whole chicken", "2 carrots"],
+    instructions=["Simmer everything for two hours, then add orzo."],
+)
+
+
+def test_search_matches_all_words():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = RecipeIndex(tmpdir)
+        for recipe in (ORZO, SALAD, SOUP):
+            index.add(recipe)
+
+        assert [r.title for r in index.search("chicken orzo")] == ["Lemon Chicken Orzo", "Chicken Soup"]
+        assert [r.title for r in index.search("tomato")] == ["Tomato Salad"], "Prefixes should match"
+        assert index.search("chicken tomato") == []
+        assert index.search("") == []
+        index.close()
+
+
+def test_search_ranks_title_matches_first():
+    """Test that a title match outranks a newer recipe matching only in instructions."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = RecipeIndex(tmpdir)
+        index.add(ORZO)
+        index.add(SOUP)
+
+        assert [r.title for r in index.search("orzo")] == ["Lemon Chicken Orzo", "Chicken Soup"]
+        index.close()
+
+
+def test_index_survives_compaction_and_reopen():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = RecipeIndex(tmpdir, compact_every=2)
+        index.add(ORZO)
+        index.add(SALAD)  # Merged into the on-disk segment
+        index.add(SOUP)  # Kept in memory only
+        index.close()
+
+        reopened = RecipeIndex(tmpdir)
+        assert len(reopened) == 3
+        assert [r.title for r in reopened.search("chicken")] == ["Chicken Soup", "Lemon Chicken Orzo"]
+        assert reopened.search("basil")[0] == SALAD
+
+        reopened.compact()
+        assert [r.title for r in reopened.search("chicken")] == ["Chicken Soup", "Lemon Chicken Orzo"]
+        reopened.close()
+
+
+def test_duplicate_recipes_are_indexed_once():
+    """Test that resending the same link, or the same recipe, does not add copies."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = RecipeIndex(tmpdir, compact_every=2)
+        url = "https://www.tiktok.com/@user/video/1"
+        first = index.add(ORZO, source_url=url)
+        reworded = Recipe(title=ORZO.title, ingredients=["2 chicken thighs"], instructions=ORZO.instructions)
+        assert index.add(reworded, source_url=url) == first, "Same link should not be indexed twice"
+        index.add(SALAD)  # Merged into the on-disk segment
+        assert index.add(Recipe(title="lemon chicken  ORZO", ingredients=list(ORZO.ingredients), instructions=[])) == first
+        assert len(index) == 2
+        index.close()
+
+        reopened = RecipeIndex(tmpdir)
+        assert reopened.add(ORZO, source_url=url) == first
+        assert reopened.add(SOUP, source_url=url + "2") == 2
+        assert [r.title for r in reopened.search("orzo")] == ["Lemon Chicken Orzo", "Chicken Soup"]
+        reopened.close()
+
+        # Source URLs of recipes not yet merged to disk are re-read on open
+        reopened = RecipeIndex(tmpdir)
+        soup_resent = Recipe(title="Chicken Noodle Soup", ingredients=["chicken"], instructions=[])
+        assert reopened.add(soup_resent, source_url=url + "2") == 2
+        reopened.close()